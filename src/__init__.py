@@ -22,6 +22,7 @@ from bpy.props import (
 )
 
 from .clearslot import KeI2Mclearslot
+from .clearcache import KeI2Mclearcache
 from .batchbrowser import KeI2Mbatchbrowser
 from .filebrowser import KeI2Mfilebrowser
 from .reload import KeI2Mreload
@@ -54,6 +55,7 @@ classes = (
     KeI2Mfilebrowser,
     KeI2Mreload,
     KeI2Mclearslot,
+    KeI2Mclearcache,
     KeI2Mbatchbrowser,
 )
 
@@ -0,0 +1,107 @@
+import sys
+import bpy
+import numpy as np
+
+from .core import as_rgba, atlas_uvs, paste, shelf_pack
+from .materials import IMAGE_NODE, image_material
+from .utilities import apply_modifiers, read_pixels
+
+
+def object_image(obj):
+    """The image of an object's i2m image material(s), None without one (or with more
+    than one image: Multi image Boolean objects are not atlased)"""
+    images = set()
+    for slot in obj.material_slots:
+        m = slot.material
+        tex = m.node_tree.nodes.get(IMAGE_NODE) if m and m.node_tree else None
+        if tex is None or tex.image is None:
+            return None
+        images.add(tex.image)
+    return images.pop() if len(images) == 1 else None
+
+
+def build_atlases(context, objects, name, max_size=4096, padding=4, qnd=False):
+    """Batch post-stage: Pack the objects' images into (as few as fit max_size) atlas
+    images, remap each mesh's UVs into its image's atlas rect & give it the atlas'
+    shared material. Returns the atlas images & the replaced (source) images"""
+    found = {}
+    for obj in objects:
+        if obj.type == "MESH":
+            img = object_image(obj)
+            if img is not None:
+                found.setdefault(img, []).append(obj)
+    if not found:
+        return [], []
+
+    images = list(found)
+    sizes = [tuple(img.size) for img in images]
+    placements, atlas_sizes = shelf_pack(sizes, max_size, padding)
+    sys.stdout.write(
+        "kei2m Atlas: %s images packed in %s atlas(es)\n"
+        % (str(len(images)), str(len(atlas_sizes)))
+    )
+
+    pixels = [np.zeros((h, w, 4), dtype=np.float32) for w, h in atlas_sizes]
+    for img, (w, h), (a, x, y) in zip(images, sizes, placements):
+        paste(pixels[a], as_rgba(read_pixels(img), w, h), x, y, padding)
+
+    atlases = []
+    materials = []
+    for a, (w, h) in enumerate(atlas_sizes):
+        atlas_name = "%s_%d" % (name, a)
+        existing = bpy.data.images.get(atlas_name)
+        if existing is not None and not existing.users:
+            bpy.data.images.remove(existing)
+        atlas = bpy.data.images.new(atlas_name, w, h, alpha=True)
+        atlas.pixels.foreach_set(pixels[a].ravel())
+        # (Generated images are lost on save unless packed)
+        atlas.pack()
+        atlases.append(atlas)
+        materials.append(image_material(atlas_name + "_Material", atlas, qnd))
+    pixels = None
+
+    # Mesh: The image its UVs are remapped for. Meshes shared with another image
+    # (instancing) are copied here, before any UVs are remapped
+    rects = {}
+    mesh_images = {}
+    copies = {}
+    old_materials = set()
+    for img, (w, h), (a, x, y) in zip(images, sizes, placements):
+        rects[img] = a, (x, y, w, h)
+        for obj in found[img]:
+            if obj.modifiers:
+                # Live UV projection: The atlas needs the UVs in the mesh
+                apply_modifiers(context, obj)
+                for child in list(obj.children):
+                    if child.type == "EMPTY" and child.name.endswith("_UVProjector"):
+                        bpy.data.objects.remove(child)
+            mesh = obj.data
+            if mesh_images.setdefault(mesh, img) is not img:
+                # Needs UVs (& materials) of its own
+                if (mesh, img) not in copies:
+                    copies[mesh, img] = mesh.copy()
+                    mesh_images[copies[mesh, img]] = img
+                obj.data = copies[mesh, img]
+            old_materials.update(s.material for s in obj.material_slots if s.material)
+            if any(slot.link == "OBJECT" for slot in obj.material_slots):
+                # Instanced mesh: The object's own slots
+                for slot in obj.material_slots:
+                    slot.material = materials[a]
+            else:
+                obj.data.materials.clear()
+                obj.data.materials.append(materials[a])
+
+    for mesh, img in mesh_images.items():
+        uv_layer = mesh.uv_layers.get("UVmap") or mesh.uv_layers.active
+        if uv_layer is None:
+            continue
+        a, rect = rects[img]
+        uvs = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+        uv_layer.data.foreach_get("uv", uvs)
+        uvs = atlas_uvs(uvs, rect, atlas_sizes[a])
+        uv_layer.data.foreach_set("uv", uvs.ravel())
+
+    for m in old_materials:
+        if not m.users:
+            bpy.data.materials.remove(m)
+    return atlases, images
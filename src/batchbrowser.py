@@ -1,4 +1,5 @@
 import os
+import shutil
 import sys
 import bpy
 from bpy.types import Operator
@@ -7,7 +8,11 @@ from bpy.props import (
     StringProperty,
 )
 
-from .utilities import load_slot
+from .atlas import build_atlases
+from .batchworker import append_results, batch_settings, start_workers
+from .cache import batch_meshes
+from .merge import merge_objects
+from .utilities import IMAGE_EXTENSIONS, release_image, stream_images
 
 
 class KeI2Mbatchbrowser(Operator, ImportHelper):
@@ -21,49 +26,113 @@ class KeI2Mbatchbrowser(Operator, ImportHelper):
         if not self.filepath:
             return {"CANCELLED"}
 
-        # Load images in folder to Batch
-        filter_glob = (
-            ".png",
-            ".tif",
-            ".tiff",
-            ".exr",
-            ".hdr",
-            ".tga",
-            ".sgi",
-            ".rgb",
-            ".bw",
-            ".jp2",
-            ".j2c",
-            ".cin",
-            ".dpx",
-        )
-        images = []
+        kap = context.preferences.addons["ke_i2m"].preferences
+        if kap.batch_workers > 1:
+            paths = [
+                os.path.join(self.filepath, file)
+                for file in sorted(os.listdir(self.filepath))
+                if file.lower().endswith(IMAGE_EXTENSIONS)
+            ]
+            if len(paths) > 1:
+                return self.execute_workers(context, paths, kap.batch_workers)
+
+        # Stream: Load, convert & release one image at a time (flat memory use)
+        k_props = context.scene.kei2m
+        bpy.ops.ke.i2m_clearslot(axis="ALL")
+        batch_meshes.clear()
+        preloaded = set(bpy.data.images)
+        existing = set(bpy.data.objects)
         img_count = 0
 
-        for file in os.listdir(self.filepath):
-            if file.lower().endswith(filter_glob):
-                path = os.path.join(self.filepath, file)
-                img = load_slot(path)
-                if img is not None:
-                    img_count += 1
-                    images.append(file)
+        for img in stream_images(self.filepath, IMAGE_EXTENSIONS):
+            k_props.FRONT = img.name
+            bpy.ops.ke.i2m(batch=True)
+            release_image(img, preloaded)
+            img_count += 1
 
-        if not images:
+        k_props.FRONT = ""
+        objects = [o for o in bpy.data.objects if o not in existing]
+        self.finish_batch(context, objects, preloaded, self.collection(context))
+
+        if not img_count:
             sys.stdout.write(
                 "\nkei2m Batch Process Aborted: No images could be loaded\n"
             )
             self.report({"INFO"}, "Aborted: No images could be loaded")
             return {"CANCELLED"}
 
-        sys.stdout.write("\nkei2m Batch Process Images Loaded: %s\n" % str(img_count))
+        sys.stdout.write("\nkei2m Batch Process Images Done: %s\n" % str(img_count))
+        return {"FINISHED"}
 
-        # Batch all loaded images
-        k_props = context.scene.kei2m
-        bpy.ops.ke.i2m_clearslot(axis="ALL")
+    def execute_workers(self, context, paths, workers):
+        sys.stdout.write(
+            "\nkei2m Batch Process: %s images on %s background workers\n"
+            % (str(len(paths)), str(workers))
+        )
+        tmp, jobs = start_workers(paths, batch_settings(context), workers)
+        preloaded = set(bpy.data.images)
 
-        for img in images:
-            k_props.FRONT = img
-            bpy.ops.ke.i2m(batch=True)
+        coll = self.collection(context)
 
-        k_props.FRONT = ""
+        wm = context.window_manager
+        wm.progress_begin(0, len(jobs))
+        objects = []
+        failed = 0
+        for i, (process, job) in enumerate(jobs):
+            if process.wait() != 0:
+                failed += 1
+                sys.stdout.write(
+                    "kei2m Batch Worker failed - see log: %s\n" % job["log"]
+                )
+                continue
+            objects.extend(append_results(job, coll))
+            wm.progress_update(i + 1)
+        wm.progress_end()
+
+        self.finish_batch(context, objects, preloaded, coll)
+
+        if not failed:
+            shutil.rmtree(tmp, ignore_errors=True)
+        else:
+            self.report({"WARNING"}, "%s batch worker(s) failed" % str(failed))
+
+        sys.stdout.write(
+            "kei2m Batch Process Complete: %s objects appended\n" % str(len(objects))
+        )
         return {"FINISHED"}
+
+    @staticmethod
+    def collection(context):
+        # Get current collection
+        cvl = context.view_layer.active_layer_collection.name
+        if cvl in bpy.data.collections:
+            return bpy.data.collections[cvl]
+        return context.scene.collection
+
+    def finish_batch(self, context, objects, preloaded, coll):
+        # Optional post-stages: Atlas, then merge
+        kap = context.preferences.addons["ke_i2m"].preferences
+        # (Mesh objects only: The post-stages remove UV projector empties)
+        objects = [o for o in objects if o.type == "MESH"]
+        name = os.path.basename(os.path.normpath(self.filepath)) + "_i2m"
+        if kap.batch_atlas:
+            _, images = build_atlases(
+                context,
+                objects,
+                name + "_atlas",
+                kap.atlas_size,
+                kap.atlas_padding,
+                context.scene.kei2m.qnd_mat,
+            )
+            # The source images are only needed for the atlas
+            for img in images:
+                release_image(img, preloaded)
+        if kap.batch_merge:
+            merge_objects(
+                context,
+                objects,
+                name + "_merged",
+                coll,
+                kap.merge_layout,
+                kap.merge_max_faces,
+            )
@@ -0,0 +1,128 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import bpy
+
+from .cache import batch_meshes
+from .utilities import load_slot, release_image
+
+# Scene (kei2m) & addon preference settings used by the batch
+SETTINGS = (
+    "opacity",
+    "workres",
+    "geo",
+    "screw_flip",
+    "screw_xcomp",
+    "reduce",
+    "shade_smooth",
+    "qnd_mat",
+    "apply",
+    "apply_none",
+    "angle",
+    "custom_workres",
+    "vcolor",
+    "tile_size",
+    "outline_tolerance",
+    "bool_engine",
+    "live_uv",
+)
+PREFS = ("use_rgb", "user_rgb", "cap")
+
+
+def batch_settings(context):
+    k = context.scene.kei2m
+    kap = context.preferences.addons["ke_i2m"].preferences
+    settings = {s: getattr(k, s) for s in SETTINGS}
+    settings.update({s: getattr(kap, s) for s in PREFS})
+    settings["user_rgb"] = tuple(kap.user_rgb)
+    return settings
+
+
+def start_workers(paths, settings, workers):
+    """Fan the images out (round robin) to background Blender processes.
+    Returns the temp dir & (process, job) list - wait on the processes before use"""
+    tmp = tempfile.mkdtemp(prefix="kei2m_batch_")
+    jobs = []
+    for n in range(workers):
+        chunk = paths[n::workers]
+        if not chunk:
+            continue
+        job = {
+            "images": chunk,
+            "settings": settings,
+            "output": os.path.join(tmp, "worker_%d.blend" % n),
+            "manifest": os.path.join(tmp, "worker_%d.json" % n),
+            "log": os.path.join(tmp, "worker_%d.log" % n),
+        }
+        job_path = os.path.join(tmp, "job_%d.json" % n)
+        with open(job_path, "w") as f:
+            json.dump(job, f)
+        with open(job["log"], "w") as log:
+            process = subprocess.Popen(
+                [
+                    bpy.app.binary_path,
+                    "-b",
+                    "--python-exit-code",
+                    "1",
+                    "--python-expr",
+                    "import %s.batchworker as w; w.main()" % __package__,
+                    "--",
+                    job_path,
+                ],
+                stdout=log,
+                stderr=subprocess.STDOUT,
+            )
+        jobs.append((process, job))
+    return tmp, jobs
+
+
+def append_results(job, collection):
+    """Append a finished worker's objects into the collection, returns the new objects"""
+    if not os.path.exists(job["manifest"]):
+        return []
+    with open(job["manifest"]) as f:
+        results = json.load(f)
+    names = {name for r in results for name in r["objects"]}
+    with bpy.data.libraries.load(job["output"]) as (data_from, data_to):
+        data_to.objects = [name for name in data_from.objects if name in names]
+    objects = [obj for obj in data_to.objects if obj is not None]
+    for obj in objects:
+        collection.objects.link(obj)
+    return objects
+
+
+def main():
+    """Worker entry point (in the background Blender process)"""
+    job_path = sys.argv[sys.argv.index("--") + 1]
+    with open(job_path) as f:
+        job = json.load(f)
+
+    context = bpy.context
+    k = context.scene.kei2m
+    kap = context.preferences.addons["ke_i2m"].preferences
+    for key, value in job["settings"].items():
+        setattr(kap if key in PREFS else k, key, value)
+
+    bpy.ops.ke.i2m_clearslot(axis="ALL")
+    batch_meshes.clear()
+    preloaded = set(bpy.data.images)
+    results = []
+    objects = []
+    for path in job["images"]:
+        img = load_slot(path)
+        new = []
+        if img is not None:
+            existing = set(bpy.data.objects)
+            k.FRONT = img.name
+            bpy.ops.ke.i2m(batch=True)
+            new = [o for o in bpy.data.objects if o not in existing]
+            objects.extend(new)
+            release_image(img, preloaded)
+        results.append({"image": path, "objects": [o.name for o in new]})
+    k.FRONT = ""
+
+    bpy.data.libraries.write(job["output"], set(objects), path_remap="ABSOLUTE")
+    with open(job["manifest"], "w") as f:
+        json.dump(results, f)
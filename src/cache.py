@@ -0,0 +1,74 @@
+import os
+from collections import OrderedDict
+import bpy
+
+
+def nbytes(value):
+    """Rough memory size of a stage result (numpy arrays in nested tuples/lists)"""
+    if hasattr(value, "nbytes"):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sum(nbytes(v) for v in value) + 64
+    return 64
+
+
+class StageCache:
+    """LRU cache of pipeline stage results, kept within a memory budget (bytes).
+    Keys are tuples of the image identity + the parameters each stage depends on,
+    None keys are not cached"""
+
+    def __init__(self, budget=0):
+        self.budget = budget
+        self.size = 0
+        self.items = OrderedDict()
+
+    def get(self, key):
+        if key is None or key not in self.items:
+            return None
+        self.items.move_to_end(key)
+        return self.items[key][0]
+
+    def put(self, key, value):
+        if key is None:
+            return
+        size = nbytes(value)
+        if key in self.items:
+            self.size -= self.items.pop(key)[1]
+        if size > self.budget:
+            return
+        self.items[key] = (value, size)
+        self.size += size
+        while self.size > self.budget:
+            self.size -= self.items.popitem(last=False)[1][1]
+
+    def set_budget(self, budget):
+        self.budget = budget
+        while self.items and self.size > self.budget:
+            self.size -= self.items.popitem(last=False)[1][1]
+
+    def clear(self):
+        self.items.clear()
+        self.size = 0
+
+
+def stage_key(parent, *params):
+    """Key for a stage depending on the parent stage (key) & params"""
+    if parent is None:
+        return None
+    return parent + params
+
+
+def image_key(img):
+    """Identity of an image's contents, None for unsaved (painted) images"""
+    if img.is_dirty:
+        return None
+    path = bpy.path.abspath(img.filepath)
+    mtime = os.path.getmtime(path) if os.path.isfile(path) else 0
+    return (img.name, path, mtime, tuple(img.size))
+
+
+# Redo panel stage cache (budget set from the addon prefs on each run)
+stage_cache = StageCache()
+
+# Batch instancing: Component mesh names by mask hash (cleared per batch)
+batch_meshes = {}
@@ -0,0 +1,14 @@
+from bpy.types import Operator
+
+from . import diskcache
+
+
+class KeI2Mclearcache(Operator):
+    bl_idname = "ke.i2m_clearcache"
+    bl_label = "Clear i2m Disk Cache"
+    bl_description = "Remove all meshes stored in the i2m disk cache"
+
+    def execute(self, context):
+        count = diskcache.clear()
+        self.report({"INFO"}, "i2m: Removed %i cached meshes" % count)
+        return {"FINISHED"}
@@ -0,0 +1,229 @@
+"""Headless command line entry point, e.g:
+
+    blender -b --python-expr "import ke_i2m.cli as c; c.main()" -- \\
+        --geo SCREW --workres 256 --format glb --output out/ images/*.png
+
+One output file per image (glb, obj or blend). Per image timing (per stage) is
+written as JSON lines, to stdout or --report. Run with -- --help for all flags
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+import addon_utils
+import bpy
+
+from .main import KeI2M
+from .profiler import reports, stage_seconds
+from .prefs.props import KeI2Mprops
+from .utilities import IMAGE_EXTENSIONS, load_slot, release_image
+
+FORMATS = ("glb", "obj", "blend")
+
+# Addon preferences the command line sets for its run (restored afterwards)
+PREF_OVERRIDES = ("use_rgb", "user_rgb", "cap", "disk_cache", "cache_budget")
+
+
+def operator_flags(parser, cls):
+    """argparse flags for the (non-hidden) properties of an operator class"""
+    names = []
+    for name, prop in cls.__annotations__.items():
+        keywords = getattr(prop, "keywords", None)
+        if keywords is None or "HIDDEN" in keywords.get("options", ()):
+            continue
+        flag = "--" + name.replace("_", "-")
+        help_text = keywords.get("name", name)
+        kind = prop.function.__name__
+        if kind == "BoolProperty":
+            parser.add_argument(
+                flag, dest=name, action=argparse.BooleanOptionalAction, help=help_text
+            )
+        elif kind == "EnumProperty":
+            choices = [item[0] for item in keywords["items"]]
+            parser.add_argument(flag, dest=name, choices=choices, help=help_text)
+        elif kind == "IntProperty":
+            parser.add_argument(flag, dest=name, type=int, help=help_text)
+        elif kind == "FloatProperty":
+            parser.add_argument(flag, dest=name, type=float, help=help_text)
+        else:
+            continue
+        names.append(name)
+    return names
+
+
+def make_parser():
+    parser = argparse.ArgumentParser(
+        prog="blender -b --python-expr 'import ke_i2m.cli as c; c.main()' --",
+        description="kei2m: Convert images to meshes, one output file per image",
+    )
+    parser.add_argument(
+        "inputs", nargs="+", help="Image files, folders or (quoted) glob patterns"
+    )
+    parser.add_argument("-o", "--output", default=".", help="Output folder")
+    parser.add_argument("-f", "--format", choices=FORMATS, default="glb")
+    parser.add_argument(
+        "--report", help="Write the per image timing JSON lines to this file"
+    )
+    geo = KeI2Mprops.__annotations__["geo"].keywords
+    parser.add_argument(
+        "--geo",
+        choices=[item[0] for item in geo["items"]],
+        default=geo["default"],
+        help=geo["name"],
+    )
+    parser.add_argument(
+        "--use-rgb", action=argparse.BooleanOptionalAction, help="Use RGB (not Alpha)"
+    )
+    parser.add_argument(
+        "--rgb", type=float, nargs=3, metavar=("R", "G", "B"), help="RGB color to use"
+    )
+    parser.add_argument("--cap", type=int, help="Material Cap (C2M)")
+    parser.add_argument(
+        "--disk-cache", action=argparse.BooleanOptionalAction, help="Use the disk cache"
+    )
+    return parser
+
+
+def image_paths(inputs):
+    """Image files from file, folder & glob inputs (sorted per input, no duplicates)"""
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            found = [e.path for e in os.scandir(item) if e.is_file()]
+        else:
+            found = glob.glob(item) if glob.has_magic(item) else [item]
+        for path in sorted(found):
+            if path.lower().endswith(IMAGE_EXTENSIONS) and path not in paths:
+                paths.append(path)
+    return paths
+
+
+def export(objects, path, file_format):
+    if file_format == "blend":
+        bpy.data.libraries.write(path, set(objects), path_remap="ABSOLUTE")
+        return
+    for obj in bpy.context.view_layer.objects:
+        obj.select_set(False)
+    for obj in objects:
+        obj.select_set(True)
+    if file_format == "glb":
+        bpy.ops.export_scene.gltf(
+            filepath=path, export_format="GLB", use_selection=True
+        )
+    elif hasattr(bpy.ops.wm, "obj_export"):
+        bpy.ops.wm.obj_export(filepath=path, export_selected_objects=True)
+    else:
+        bpy.ops.export_scene.obj(filepath=path, use_selection=True)
+
+
+def remove_objects(objects):
+    meshes = {obj.data for obj in objects if obj.type == "MESH"}
+    for obj in objects:
+        bpy.data.objects.remove(obj)
+    for mesh in meshes:
+        if not mesh.users:
+            bpy.data.meshes.remove(mesh)
+    for material in list(bpy.data.materials):
+        if not material.users:
+            bpy.data.materials.remove(material)
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else []
+    parser = make_parser()
+    op_names = operator_flags(parser, KeI2M)
+    args = parser.parse_args(argv)
+
+    paths = image_paths(args.inputs)
+    if not paths:
+        parser.error("No images found")
+
+    # Enabled for the run only: Left out of the saved preferences afterwards
+    enabled = __package__ in bpy.context.preferences.addons
+    if not enabled:
+        addon_utils.enable(__package__, default_set=True)
+    kap = bpy.context.preferences.addons[__package__].preferences
+    saved = {}
+    for name in PREF_OVERRIDES:
+        value = getattr(kap, name)
+        saved[name] = tuple(value) if hasattr(value, "__len__") else value
+    try:
+        if args.use_rgb is not None:
+            kap.use_rgb = args.use_rgb
+        if args.rgb is not None:
+            kap.user_rgb = args.rgb
+        if args.cap is not None:
+            kap.cap = args.cap
+        if args.disk_cache is not None:
+            kap.disk_cache = args.disk_cache
+        # No redo panel here: Don't keep stage results around between images
+        kap.cache_budget = 0
+        op_args = {n: getattr(args, n) for n in op_names}
+        op_args = {n: v for n, v in op_args.items() if v is not None}
+        failed = convert_images(args, op_args, paths)
+    finally:
+        for name, value in saved.items():
+            setattr(kap, name, value)
+        if not enabled:
+            addon_utils.disable(__package__, default_set=True)
+
+    sys.stdout.write(
+        "\nkei2m: %s of %s images converted\n" % (len(paths) - failed, len(paths))
+    )
+    if failed:
+        sys.exit(1)
+
+
+def convert_images(args, op_args, paths):
+    """Convert & export each image, writes the report lines. Returns the fail count"""
+    k = bpy.context.scene.kei2m
+    os.makedirs(args.output, exist_ok=True)
+    report = open(args.report, "w") if args.report else sys.stdout
+
+    bpy.ops.ke.i2m_clearslot(axis="ALL")
+    preloaded = set(bpy.data.images)
+    failed = 0
+    for path in paths:
+        name = os.path.splitext(os.path.basename(path))[0]
+        output = os.path.join(os.path.abspath(args.output), name + "." + args.format)
+        result = {"image": path, "output": output, "status": "FAILED"}
+        t = time.perf_counter()
+        reports.clear()
+        stages = {}
+        img = load_slot(path)
+        if img is not None:
+            existing = set(bpy.data.objects)
+            # (The operator stores its geo mode back to the scene, reset each run)
+            k.geo = args.geo
+            k.FRONT = img.name
+            try:
+                status = bpy.ops.ke.i2m(**op_args)
+            except RuntimeError as e:
+                # Operator error: This image failed, on to the next
+                status = {"CANCELLED"}
+                result["error"] = str(e).strip()
+            objects = [o for o in bpy.data.objects if o not in existing]
+            if reports:
+                stages = stage_seconds(reports[-1])
+                result["counters"] = reports[-1]["counters"]
+            if "FINISHED" in status and objects:
+                t_export = time.perf_counter()
+                export(objects, output, args.format)
+                stages["Export"] = time.perf_counter() - t_export
+                result["status"] = "FINISHED"
+            remove_objects(objects)
+            release_image(img, preloaded)
+            k.FRONT = ""
+        if result["status"] != "FINISHED":
+            failed += 1
+        result["stages"] = stages
+        result["total"] = time.perf_counter() - t
+        report.write(json.dumps(result) + "\n")
+        report.flush()
+
+    if report is not sys.stdout:
+        report.close()
+    return failed
@@ -0,0 +1,83 @@
+# kei2m core: bpy-independent (NumPy) conversion helpers
+from .atlas import atlas_uvs, paste, shelf_pack
+from .contour import ccw_triangles, outline_loops, simplify_loop, trace_outlines
+from .convert import (
+    convert,
+    mask_pixels,
+    mesh_arrays,
+    opacity_tolerance,
+    screw_window,
+)
+from .hull import hull_arrays
+from .merge import chunk_parts, layout_offsets, merge_arrays
+from .mesh import (
+    AXIS_PLANES,
+    axis_material_index,
+    corner_grid,
+    corner_verts,
+    fill_loops,
+    flip_faces,
+    grid_arrays,
+    outline_arrays,
+    weld_verts,
+)
+from .palette import reduce_colors
+from .pixelmap import (
+    as_rgba,
+    dilate,
+    dilate_pixels,
+    opaque_mask,
+    pixel_arrays,
+    pixel_mask,
+)
+from .tiles import (
+    stitch_tiles,
+    tile_grid,
+    tile_mesh_arrays,
+    tile_pixels,
+)
+from .triangulate import tessellate_loops
+from .uv import PROJECTOR_ROTATIONS, project_uvs, projector_matrix
+
+__all__ = [
+    "AXIS_PLANES",
+    "PROJECTOR_ROTATIONS",
+    "as_rgba",
+    "atlas_uvs",
+    "axis_material_index",
+    "ccw_triangles",
+    "chunk_parts",
+    "convert",
+    "corner_grid",
+    "corner_verts",
+    "dilate",
+    "dilate_pixels",
+    "fill_loops",
+    "flip_faces",
+    "grid_arrays",
+    "hull_arrays",
+    "layout_offsets",
+    "mask_pixels",
+    "merge_arrays",
+    "mesh_arrays",
+    "opacity_tolerance",
+    "opaque_mask",
+    "outline_arrays",
+    "outline_loops",
+    "paste",
+    "pixel_arrays",
+    "pixel_mask",
+    "project_uvs",
+    "projector_matrix",
+    "reduce_colors",
+    "screw_window",
+    "shelf_pack",
+    "simplify_loop",
+    "stitch_tiles",
+    "tessellate_loops",
+    "tile_grid",
+    "tile_mesh_arrays",
+    "tile_pixels",
+    "trace_outlines",
+    "weld_verts",
+]
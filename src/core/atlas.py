@@ -0,0 +1,61 @@
+import numpy as np
+
+
+def shelf_pack(sizes, max_size=4096, padding=0):
+    """Shelf packing of (w, h) rects into atlases of at most max_size x max_size:
+    Tallest first, left to right in rows (shelves), a new atlas when one is full.
+    Each rect gets padding pixels around it. Rects too big for max_size get an atlas
+    of their own. Returns (atlas, x, y) per rect & the (width, height) per atlas"""
+    placements = [None] * len(sizes)
+    atlases = []
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0]))
+    for i in order:
+        w = sizes[i][0] + 2 * padding
+        h = sizes[i][1] + 2 * padding
+        placed = None
+        for a, atlas in enumerate(atlases):
+            if atlas["single"]:
+                continue
+            # Shelf: [y, height, x cursor]
+            for shelf in atlas["shelves"]:
+                if h <= shelf[1] and shelf[2] + w <= max_size:
+                    placed = a, shelf[2], shelf[0]
+                    shelf[2] += w
+                    break
+            if placed is None and atlas["top"] + h <= max_size and w <= max_size:
+                atlas["shelves"].append([atlas["top"], h, w])
+                placed = a, 0, atlas["top"]
+                atlas["top"] += h
+            if placed is not None:
+                break
+        if placed is None:
+            single = w > max_size or h > max_size
+            atlases.append({"shelves": [[0, h, w]], "top": h, "single": single})
+            placed = len(atlases) - 1, 0, 0
+        a, x, y = placed
+        placements[i] = (a, x + padding, y + padding)
+
+    widths = [0] * len(atlases)
+    for a, atlas in enumerate(atlases):
+        widths[a] = max(shelf[2] for shelf in atlas["shelves"])
+    return placements, [(widths[a], atlas["top"]) for a, atlas in enumerate(atlases)]
+
+
+def paste(atlas, pixels, x, y, padding=0):
+    """Copy (h, w, 4) pixels into an (H, W, 4) atlas at x, y (bottom-left), with the
+    edge pixels repeated into the padding (no bleeding under texture filtering)"""
+    if padding:
+        pad = (padding, padding)
+        pixels = np.pad(pixels, (pad, pad, (0, 0)), "edge")
+    h, w = pixels.shape[:2]
+    atlas[y - padding : y - padding + h, x - padding : x - padding + w] = pixels
+
+
+def atlas_uvs(uvs, rect, size):
+    """(n, 2) UVs of one image remapped into its (x, y, w, h) rect of an atlas"""
+    x, y, w, h = rect
+    width, height = size
+    uvs = np.asarray(uvs, dtype=np.float32).reshape(-1, 2)
+    scale = np.array((w / width, h / height), dtype=np.float32)
+    offset = np.array((x / width, y / height), dtype=np.float32)
+    return uvs * scale + offset
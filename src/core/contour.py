@@ -0,0 +1,200 @@
+import numpy as np
+
+# Boundary edge directions on the pixel corner grid: right, up, left, down
+DIRECTIONS = np.array(((1, 0), (0, 1), (-1, 0), (0, -1)), dtype=np.int64)
+
+
+def boundary_edges(mask):
+    """Directed pixel border edges of a (width, height) bool mask, on the corner grid.
+    Filled pixels are kept on the left side: Outer borders run CCW, holes CW.
+    Returns (n, 2) edge start corners & (n) direction indices"""
+    m = np.pad(mask, 1)
+    filled = m[1:-1, 1:-1]
+    starts = []
+    directions = []
+    # (border test, start corner offset) per direction
+    sides = (
+        (filled & ~m[1:-1, :-2], (0, 0)),  # bottom, going right
+        (filled & ~m[2:, 1:-1], (1, 0)),  # right, going up
+        (filled & ~m[1:-1, 2:], (1, 1)),  # top, going left
+        (filled & ~m[:-2, 1:-1], (0, 1)),  # left, going down
+    )
+    for d, (border, offset) in enumerate(sides):
+        xy = np.argwhere(border) + offset
+        starts.append(xy)
+        directions.append(np.full(len(xy), d, dtype=np.int64))
+    return np.concatenate(starts), np.concatenate(directions)
+
+
+def trace_outlines(mask):
+    """Closed border loops of a (width, height) bool mask, as (k, 2) corner coords.
+    Only the corners where the border turns are kept. Diagonally touching pixels
+    are traced as separate loops (always turning left at a shared corner)"""
+    starts, directions = boundary_edges(mask)
+    count = len(starts)
+    if not count:
+        return []
+    ends = starts + DIRECTIONS[directions]
+    rows = int(max(starts[:, 1].max(), ends[:, 1].max())) + 1
+    start_keys = starts[:, 0] * rows + starts[:, 1]
+    end_keys = ends[:, 0] * rows + ends[:, 1]
+
+    # Link each edge to the edge(s) leaving its end corner
+    order = np.argsort(start_keys, kind="stable")
+    sorted_keys = start_keys[order]
+    first = np.searchsorted(sorted_keys, end_keys, side="left")
+    last = np.searchsorted(sorted_keys, end_keys, side="right")
+    next_edge = order[first]
+    saddles = np.flatnonzero(last - first == 2)
+    if len(saddles):
+        second = order[first[saddles] + 1]
+        left_turn = (directions[saddles] + 1) % 4
+        use_second = directions[second] == left_turn
+        next_edge[saddles[use_second]] = second[use_second]
+
+    next_edge = next_edge.tolist()
+    visited = [False] * count
+    loops = []
+    for e in range(count):
+        if visited[e]:
+            continue
+        loop = []
+        while not visited[e]:
+            visited[e] = True
+            loop.append(e)
+            e = next_edge[e]
+        loop = np.array(loop)
+        turns = directions[loop] != np.roll(directions[loop], 1)
+        loops.append(starts[loop[turns]])
+    return loops
+
+
+def simplify_loop(points, tolerance, keep=None):
+    """Douglas-Peucker simplification of a closed (k, 2) loop, tolerance in pixels.
+    keep: Optional (k) bool mask of points that must stay (pinned tile seams).
+    Loops that would collapse below a triangle are returned as-is"""
+    count = len(points)
+    if count <= 3 or tolerance <= 0:
+        return points
+    points = points.astype(np.float64)
+    # Split the loop at its first point & the point farthest from it (& pins)
+    far = int(np.argmax(((points - points[0]) ** 2).sum(axis=1)))
+    closed = np.vstack((points, points[:1]))
+    keep = np.zeros(count, dtype=bool) if keep is None else keep.copy()
+    keep[0] = keep[far] = True
+    fixed = np.append(np.flatnonzero(keep), count)
+    stack = list(zip(fixed[:-1].tolist(), fixed[1:].tolist()))
+    while stack:
+        a, b = stack.pop()
+        if b - a < 2:
+            continue
+        seg = closed[a + 1 : b] - closed[a]
+        d = closed[b] - closed[a]
+        length = np.hypot(d[0], d[1])
+        if length == 0:
+            dist = np.hypot(seg[:, 0], seg[:, 1])
+        else:
+            dist = np.abs(d[0] * seg[:, 1] - d[1] * seg[:, 0]) / length
+        i = int(np.argmax(dist))
+        if dist[i] > tolerance:
+            k = a + 1 + i
+            keep[k] = True
+            stack.append((a, k))
+            stack.append((k, b))
+    if keep.sum() < 3:
+        return points
+    return points[keep]
+
+
+def crossing_loops(loops, cell=8):
+    """Indices of the closed (k, 2) loops with a segment crossing another segment (of
+    any loop), or touching one away from their shared corners. Segment pairs are only
+    tested within the (cell sized) grid buckets their bounding boxes overlap"""
+    if not loops:
+        return set()
+    p = np.concatenate(loops).astype(np.float64)
+    lengths = np.array([len(loop) for loop in loops])
+    owner = np.repeat(np.arange(len(loops)), lengths)
+    # Segment ends: The next point, back to the first at each loop's end
+    following = np.arange(1, len(p) + 1)
+    following[np.cumsum(lengths) - 1] = np.cumsum(lengths) - lengths
+    q = p[following]
+
+    # Bucket each segment into the grid cells of its bounding box
+    low = (np.minimum(p, q) // cell).astype(np.int64)
+    high = (np.maximum(p, q) // cell).astype(np.int64)
+    span = high - low + 1
+    counts = span[:, 0] * span[:, 1]
+    segment = np.repeat(np.arange(len(p)), counts)
+    index = np.arange(len(segment)) - np.repeat(np.cumsum(counts) - counts, counts)
+    cx = low[segment, 0] + index % span[segment, 0]
+    cy = low[segment, 1] + index // span[segment, 0]
+    rows = int(cy.max()) + 1
+    order = np.argsort(cx * rows + cy, kind="stable")
+    keys = (cx * rows + cy)[order]
+    segment = segment[order]
+    bounds = np.flatnonzero(np.diff(keys)) + 1
+    starts = np.concatenate(([0], bounds))
+    sizes = np.diff(np.append(starts, len(keys)))
+
+    # Segment pairs sharing a bucket (the buckets of each size at once)
+    first = []
+    second = []
+    for size in np.unique(sizes[sizes > 1]).tolist():
+        bucket = starts[sizes == size][:, None]
+        i, j = np.triu_indices(size, 1)
+        first.append(segment[(bucket + i).ravel()])
+        second.append(segment[(bucket + j).ravel()])
+    if not first:
+        return set()
+    a = np.concatenate(first)
+    b = np.concatenate(second)
+
+    def side(s, e, point):
+        d = e - s
+        v = point - s
+        return d[:, 0] * v[:, 1] - d[:, 1] * v[:, 0]
+
+    def inside(s, e, point, d):
+        # point (collinear: d == 0) strictly between s & e
+        v = e - s
+        t = ((point - s) * v).sum(axis=1)
+        return (d == 0) & (t > 0) & (t < (v * v).sum(axis=1))
+
+    p1, q1, p2, q2 = p[a], q[a], p[b], q[b]
+    d1, d2 = side(p1, q1, p2), side(p1, q1, q2)
+    d3, d4 = side(p2, q2, p1), side(p2, q2, q1)
+    hit = (d1 * d2 < 0) & (d3 * d4 < 0)
+    hit |= inside(p1, q1, p2, d1) | inside(p1, q1, q2, d2)
+    hit |= inside(p2, q2, p1, d3) | inside(p2, q2, q1, d4)
+    return set(owner[a[hit]].tolist()) | set(owner[b[hit]].tolist())
+
+
+def uncrossed_loops(traced, simplified):
+    """The simplified loops, with those crossing another loop (or themselves: Loops
+    are simplified one at a time) put back to their traced originals"""
+    loops = list(simplified)
+    while True:
+        crossing = [i for i in crossing_loops(loops) if loops[i] is not traced[i]]
+        if not crossing:
+            return loops
+        for i in crossing:
+            loops[i] = traced[i]
+
+
+def outline_loops(mask, tolerance=1.0):
+    """Traced & simplified border loops of a (width, height) bool mask"""
+    traced = trace_outlines(mask)
+    return uncrossed_loops(traced, [simplify_loop(l, tolerance) for l in traced])
+
+
+def ccw_triangles(points, triangles):
+    """Flip any clockwise (n, 3) triangles of (k, 2) points to counter-clockwise,
+    dropping flat ones (scanfill fans those along straight runs)"""
+    a, b, c = (points[triangles[:, i]] for i in range(3))
+    area = (b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) - (b[:, 1] - a[:, 1]) * (
+        c[:, 0] - a[:, 0]
+    )
+    triangles = triangles.copy()
+    triangles[area < 0] = triangles[area < 0][:, ::-1]
+    return triangles[area != 0]
@@ -0,0 +1,98 @@
+import numpy as np
+
+from .mesh import flip_faces, grid_arrays, outline_arrays
+from .palette import reduce_colors
+from .pixelmap import as_rgba, dilate_pixels, pixel_arrays, pixel_mask
+
+
+def opacity_tolerance(opacity, rgb=False):
+    """Mask tolerance for an opacity (percent) setting. RGB matching uses half of it"""
+    if rgb:
+        # hard to find opc value that "feels" good here...
+        return float(opacity * 0.5 / 100)
+    return float(opacity / 100)
+
+
+def screw_window(width, flip=False):
+    """Column range (start, stop) of the image half revolved by a screw conversion"""
+    if flip:
+        return int(width / 2), width
+    return 0, int(width / 2)
+
+
+def mask_pixels(rgba, tolerance, rgb=None, dilation=0, start=0, stop=None):
+    """Pixel coords & colors of the (dilated) mask of an (h, w, 4) rgba array"""
+    if dilation != 0:
+        rgba = dilate_pixels(rgba, dilation, tolerance, rgb, start=start, stop=stop)
+    return pixel_arrays(rgba, tolerance, rgb, start=start, stop=stop)
+
+
+def mesh_arrays(
+    pixel_xy, work_res, scl, axis="Front", outline_tolerance=None, tessellate=None
+):
+    """Pixel grid (quad per pixel) mesh arrays, or the filled outline with a tolerance"""
+    if outline_tolerance is None:
+        return grid_arrays(pixel_xy, scl, work_res, axis)
+    mask = pixel_mask(pixel_xy, work_res, work_res)
+    return outline_arrays(mask, scl, work_res, axis, outline_tolerance, tessellate)
+
+
+def convert(
+    pixels,
+    width,
+    height,
+    scl,
+    axis="Front",
+    opacity=50,
+    rgb=None,
+    dilation=0,
+    window=(0, None),
+    color_threshold=0,
+    color_cap=None,
+    materials=False,
+    vertex_colors=False,
+    outline_tolerance=None,
+    flip=False,
+    tessellate=None,
+):
+    """Image (flat or (h, w, 4) float rgba pixels) to mesh arrays, without Blender.
+    rgb: Mask by this color instead of alpha. window: (start, stop) image columns used.
+    color_threshold > 0: Palette quantisation (color_cap = max. palette colors).
+    materials: Palette indices as face material indices. vertex_colors: Face colors.
+    outline_tolerance: Filled outline instead of a quad per pixel (no colors).
+    tessellate: Loops to triangles function for outlines (default: core's own).
+    Returns a dict of arrays: verts, loops, loop_starts, material_index, palette &
+    (with vertex_colors) loop_colors"""
+    rgba = as_rgba(pixels, width, height)
+    tolerance = opacity_tolerance(opacity, rgb is not None)
+    start, stop = window
+    pixel_xy, colors = mask_pixels(rgba, tolerance, rgb, dilation, start, stop)
+
+    palette = []
+    palette_index = np.full(len(colors), -1, dtype=np.int32)
+    if color_threshold > 0:
+        colors, palette, palette_index = reduce_colors(
+            colors, threshold=color_threshold, cap=color_cap
+        )
+
+    outline = outline_tolerance is not None and not (vertex_colors or materials)
+    verts, loops, loop_starts = mesh_arrays(
+        pixel_xy, width, scl, axis, outline_tolerance if outline else None, tessellate
+    )
+    if flip:
+        loops = flip_faces(loops, loop_starts)
+
+    arrays = {
+        "verts": verts,
+        "loops": loops,
+        "loop_starts": loop_starts,
+        "material_index": np.zeros(len(loop_starts), dtype=np.int32),
+        "palette": np.array(palette, dtype=np.float32).reshape(-1, 4),
+    }
+    if materials and not outline:
+        # Ungrouped colors use the 1st slot
+        arrays["material_index"] = np.maximum(palette_index, 0)
+    if vertex_colors and not outline:
+        # Pixel quads: 4 loops per face, all in the face (pixel) color
+        arrays["loop_colors"] = np.repeat(colors, 4, axis=0)
+    return arrays
@@ -0,0 +1,309 @@
+import numpy as np
+
+from .mesh import dissolve_straight_verts
+
+# Surface nets cube edges: (corner a, corner b, edge midpoint), corners as (x, y, z)
+CUBE_EDGES = (
+    ((0, 0, 0), (1, 0, 0), (0.5, 0, 0)),
+    ((0, 1, 0), (1, 1, 0), (0.5, 1, 0)),
+    ((0, 0, 1), (1, 0, 1), (0.5, 0, 1)),
+    ((0, 1, 1), (1, 1, 1), (0.5, 1, 1)),
+    ((0, 0, 0), (0, 1, 0), (0, 0.5, 0)),
+    ((1, 0, 0), (1, 1, 0), (1, 0.5, 0)),
+    ((0, 0, 1), (0, 1, 1), (0, 0.5, 1)),
+    ((1, 0, 1), (1, 1, 1), (1, 0.5, 1)),
+    ((0, 0, 0), (0, 0, 1), (0, 0, 0.5)),
+    ((1, 0, 0), (1, 0, 1), (1, 0, 0.5)),
+    ((0, 1, 0), (0, 1, 1), (0, 1, 0.5)),
+    ((1, 1, 0), (1, 1, 1), (1, 1, 0.5)),
+)
+EDGE_MIDPOINTS = np.array([mid for _, _, mid in CUBE_EDGES])
+
+
+def hull_silhouettes(front=None, right=None, top=None, work_res=None):
+    """The 3 (work_res, work_res) bool masks as seen from the voxel grid axes:
+    front[x, z], right[y, z] & top[x, y]. Missing masks don't cut anything"""
+    if work_res is None:
+        work_res = next(len(m) for m in (front, right, top) if m is not None)
+    full = np.ones((work_res, work_res), dtype=bool)
+    front = full if front is None else front
+    right = full if right is None else right
+    # The Top component is turned 90 degrees (Z): Image u goes along +Y, v along -X
+    top = full if top is None else top[:, ::-1].T
+    return front, right, top
+
+
+def hull_bounds(front, right, top):
+    """Voxel index (start, stop) ranges on x, y & z holding any hull voxel"""
+    xs = front.any(axis=1) & top.any(axis=1)
+    ys = right.any(axis=1) & top.any(axis=0)
+    zs = front.any(axis=0) & right.any(axis=0)
+    bounds = []
+    for used in (xs, ys, zs):
+        found = np.flatnonzero(used)
+        if not len(found):
+            return None
+        bounds.append((int(found[0]), int(found[-1]) + 1))
+    return bounds
+
+
+def segment_reverse(values, starts, lengths):
+    """values with each (start, length) segment reversed in place"""
+    offset = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    first = np.repeat(starts, lengths)
+    index = first + np.repeat(lengths, lengths) - 1 - offset
+    values[first + offset] = values[index]
+    return values
+
+
+def strip_runs(cells, quads, shift, axis):
+    """Quads turned by shift (corner 0 -> 1 & 3 -> 2 step +1 along their axis) &
+    sorted into runs: Each quad followed by the one on the same axis sharing its
+    (1, 2) edge as (0, 3). Returns the turned quads in run order, that order & the
+    runs' starts & ends"""
+    turn = (np.arange(4) + shift[:, None]) % 4
+    ids = np.take_along_axis(quads, turn, axis=1).astype(np.int64)
+    rows = np.arange(len(ids))
+    lower = ids[:, 0] * len(cells) + ids[:, 3]
+    upper = ids[:, 1] * len(cells) + ids[:, 2]
+    by_lower = np.argsort(lower)
+    found = np.searchsorted(lower, upper, sorter=by_lower)
+    after = by_lower[np.minimum(found, len(ids) - 1)]
+    linked = (lower[after] == upper) & (axis[after] == axis)
+    before = rows.copy()
+    before[after[linked]] = rows[linked]
+    # Run (first quad) & place in it of each quad: Pointer doubling
+    head = before
+    place = (before != rows).astype(np.int64)
+    while True:
+        jump = head[head]
+        if (jump == head).all():
+            break
+        place = place + place[head]
+        head = jump
+    order = np.lexsort((place, head))
+    starts = np.flatnonzero(place[order] == 0)
+    ends = np.append(starts[1:], len(order))
+    return ids[order], order, starts, ends
+
+
+def axis_strips(cells, quads):
+    """Runs of coplanar quads merged into strip n-gons: A quad with 2 opposite edges
+    one voxel long along an axis (flat sides, and the walls the silhouettes are
+    extruded into) continues in the next quad along that axis with the same cross
+    edge. So a big side is a few strips instead of thousands of quads (bmesh
+    dissolves slow down with the face count of a flat region). Each strip keeps all
+    the vertices along its border, no T-junctions. cells: (v, 3) verts in voxel units.
+    Returns loops & loop starts"""
+    corners = cells[quads]
+    rows = np.arange(len(quads))
+    # Edge r: The axis it steps one voxel along (3: None) & which way
+    steps = []
+    for r in range(4):
+        edge = corners[:, (r + 1) % 4] - corners[:, r]
+        along = np.argmax(np.abs(edge), axis=1)
+        length = edge[rows, along]
+        unit = np.abs(np.abs(length) - 1) < 1e-6
+        unit &= np.count_nonzero(edge, axis=1) == 1
+        steps.append((np.where(unit, along, 3), length > 0))
+    corners = None
+    # Turn r: Edge r steps up the axis, the opposite edge back down
+    axes = np.full((len(quads), 4), 3)
+    for r in range(4):
+        (along, up), (back, back_up) = steps[r], steps[(r + 2) % 4]
+        axes[:, r] = np.where((along == back) & up & ~back_up, along, 3)
+    low = np.argmin(axes, axis=1)
+    strip = axes[rows, low] < 3
+    if not strip.any():
+        return quads.ravel(), np.arange(0, quads.size, 4)
+    f = np.flatnonzero(strip)
+    axes = axes[f]
+    low = low[f]
+    high = np.argmax(np.where(axes < 3, axes, -1), axis=1)
+    flat = np.flatnonzero(low != high)
+    if len(flat):
+        # Flat quads (a run either way, only ever with other flat quads): Along the
+        # axis with the longer run
+        runs = []
+        for turn in (low[flat], high[flat]):
+            _, order, starts, ends = strip_runs(
+                cells, quads[f[flat]], turn, axes[flat, turn]
+            )
+            length = np.empty(len(flat), dtype=np.int64)
+            length[order] = np.repeat(ends - starts, ends - starts)
+            runs.append(length)
+        shift = low.copy()
+        shift[flat] = np.where(runs[1] > runs[0], high[flat], low[flat])
+    ids, _, starts, ends = strip_runs(
+        cells, quads[f], shift, axes[np.arange(len(f)), shift]
+    )
+
+    # Strip: Up the 0 -> 1 side, then back down the 2 -> 3 side (the quads' winding)
+    length = ends - starts + 1
+    up = np.insert(ids[:, 0], ends, ids[ends - 1, 1])
+    down = np.insert(ids[:, 3], ends, ids[ends - 1, 2])
+    first = np.cumsum(length) - length
+    down = segment_reverse(down, first, length)
+    ring_starts = 2 * first
+    offset = np.arange(length.sum()) - np.repeat(first, length)
+    rings = np.empty(2 * length.sum(), dtype=np.int64)
+    rings[np.repeat(ring_starts, length) + offset] = up
+    rings[np.repeat(ring_starts + length, length) + offset] = down
+
+    loops = np.concatenate((quads[~strip].ravel(), rings))
+    sizes = np.concatenate((np.full(np.count_nonzero(~strip), 4), 2 * length))
+    return loops, np.cumsum(sizes) - sizes
+
+
+def hull_arrays(front, right, top, scl, work_res, merge_flat=False):
+    """Visual hull mesh arrays of the front / right / top silhouettes (None = no cut):
+    A voxel is filled when all 3 masks cover it, the surface is a surface net over the
+    voxels, built one z layer at a time (memory bound by a slice, not the volume).
+    Flat sides land on the voxel faces, the same place the solidified & intersected
+    component meshes put them. Returns (v, 3) verts, quad loops & loop starts
+    (merge_flat: With the coplanar runs of quads merged into strips & the straight
+    vertices along them dissolved)"""
+    front, right, top = hull_silhouettes(front, right, top, work_res)
+    w = (work_res * scl) * 0.5
+    bounds = hull_bounds(front, right, top)
+    if bounds is None:
+        return np.zeros((0, 3)), np.zeros(0, np.int32), np.zeros(0, np.int32)
+    (x0, x1), (y0, y1), (z0, z1) = bounds
+    front = front[x0:x1, z0:z1]
+    right = right[y0:y1, z0:z1]
+    top = top[x0:x1, y0:y1]
+    nx, ny, nz = x1 - x0, y1 - y0, z1 - z0
+
+    # Voxel slices padded with an empty border, so the surface closes everywhere
+    empty = np.zeros((nx + 2, ny + 2), dtype=bool)
+    # Padded x & y (start, stop) ranges each slice can hold voxels in: Only the
+    # window around them is searched for the surface, not the whole layer
+    ranges = [None]
+    for used in (front & top.any(axis=1)[:, None], right & top.any(axis=0)[:, None]):
+        start = np.argmax(used, axis=0) + 1
+        stop = len(used) + 1 - np.argmax(used[::-1], axis=0)
+        ranges.append(np.where(used.any(axis=0), start, 0))
+        ranges.append(np.where(used.any(axis=0), stop, 0))
+    ranges = np.pad(np.column_stack(ranges[1:]), ((1, 1), (0, 0)))
+
+    def voxel_slice(z):
+        x_start, x_stop, y_start, y_stop = ranges[z]
+        if x_start >= x_stop or y_start >= y_stop:
+            return empty
+        layer = empty.copy()
+        layer[x_start:x_stop, y_start:y_stop] = (
+            front[x_start - 1 : x_stop - 1, z - 1, None]
+            & right[None, y_start - 1 : y_stop - 1, z - 1]
+            & top[x_start - 1 : x_stop - 1, y_start - 1 : y_stop - 1]
+        )
+        return layer
+
+    verts = []
+    faces = []
+    count = 0
+    cells_prev = None
+    buffers = [(np.full((nx + 1, ny + 1), -1, dtype=np.int64), np.s_[:0]) for _ in "ab"]
+    s0 = voxel_slice(0)
+    for c in range(nz + 1):
+        s1 = voxel_slice(c + 1)
+        # Window: The padded x & y ranges of both slices
+        used = ranges[c : c + 2]
+        used = used[(used[:, 0] < used[:, 1]) & (used[:, 2] < used[:, 3])]
+        if not len(used):
+            cells_prev = None
+            s0 = s1
+            continue
+        x0w, y0w = used[:, 0].min(), used[:, 2].min()
+        x1w, y1w = used[:, 1].max(), used[:, 3].max()
+
+        # Cells: (nx + 1, ny + 1) cubes between the voxel centers of slices c & c+1,
+        # the ones in the window: From x0w - 1 to x1w (& y)
+        corners = {}
+        for dz, s in ((0, s0), (1, s1)):
+            for dx in (0, 1):
+                for dy in (0, 1):
+                    corners[dx, dy, dz] = s[
+                        x0w - 1 + dx : x1w + dx, y0w - 1 + dy : y1w + dy
+                    ]
+        # Active: Not all 8 corners the same
+        values = list(corners.values())
+        active = np.logical_or.reduce(values) & ~np.logical_and.reduce(values)
+        # (2 buffers, swapped every layer: Only the last window written is reset)
+        cells, cells_window = buffers[c % 2]
+        cells[cells_window] = -1
+        window = np.s_[x0w - 1 : x1w, y0w - 1 : y1w]
+        buffers[c % 2] = cells, window
+        cells[window][active] = np.arange(count, count + np.count_nonzero(active))
+        count += np.count_nonzero(active)
+        # Vertex: The mean of the crossed edges' midpoints
+        a, b = np.nonzero(active)
+        at = {k: v[a, b] for k, v in corners.items()}
+        crossed = np.array([at[a] != at[b] for a, b, _ in CUBE_EDGES], dtype=np.float64)
+        local = (EDGE_MIDPOINTS.T @ crossed).T / crossed.sum(axis=0)[:, None]
+        a += x0w - 1
+        b += y0w - 1
+        verts.append(np.column_stack((a, b, np.full(len(a), c))) - 0.5 + local)
+
+        # Quads across the z voxel edges (between slices c & c+1)
+        xs, ys = np.nonzero(s0[x0w:x1w, y0w:y1w] != s1[x0w:x1w, y0w:y1w])
+        xs += x0w - 1
+        ys += y0w - 1
+        quads = np.column_stack(
+            (
+                cells[xs, ys],
+                cells[xs + 1, ys],
+                cells[xs + 1, ys + 1],
+                cells[xs, ys + 1],
+            )
+        )
+        faces.append((quads, s0[xs + 1, ys + 1]))
+
+        # Quads across the x & y voxel edges of slice c (cell layers c-1 & c)
+        if cells_prev is not None:
+            xs, ys = np.nonzero(
+                s0[x0w - 1 : x1w, y0w:y1w] != s0[x0w : x1w + 1, y0w:y1w]
+            )
+            xs += x0w - 1
+            ys += y0w - 1
+            quads = np.column_stack(
+                (
+                    cells_prev[xs, ys],
+                    cells_prev[xs, ys + 1],
+                    cells[xs, ys + 1],
+                    cells[xs, ys],
+                )
+            )
+            faces.append((quads, s0[xs, ys + 1]))
+            xs, ys = np.nonzero(
+                s0[x0w:x1w, y0w - 1 : y1w] != s0[x0w:x1w, y0w : y1w + 1]
+            )
+            xs += x0w - 1
+            ys += y0w - 1
+            quads = np.column_stack(
+                (
+                    cells_prev[xs, ys],
+                    cells[xs, ys],
+                    cells[xs + 1, ys],
+                    cells_prev[xs + 1, ys],
+                )
+            )
+            faces.append((quads, s0[xs + 1, ys]))
+        cells_prev = cells
+        s0 = s1
+
+    # Wound to face +axis when the inside is on the lower side, else reversed
+    # (keeping the first corner)
+    quads = np.concatenate(
+        [np.where(inside[:, None], q, q[:, [0, 3, 2, 1]]) for q, inside in faces]
+    )
+    cells = np.concatenate(verts)
+    verts = np.empty_like(cells)
+    verts[:, 0] = (cells[:, 0] + x0) * scl - w
+    verts[:, 1] = (cells[:, 1] + y0) * scl - w
+    verts[:, 2] = (cells[:, 2] + z0) * scl
+    if merge_flat:
+        loops, loop_starts = axis_strips(cells, quads)
+        verts, loops, loop_starts = dissolve_straight_verts(verts, loops, loop_starts)
+    else:
+        loops, loop_starts = quads.ravel(), np.arange(0, quads.size, 4)
+    return verts, loops.astype(np.int32), loop_starts.astype(np.int32)
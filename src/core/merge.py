@@ -0,0 +1,51 @@
+import numpy as np
+
+
+def layout_offsets(count, cell, layout="GRID"):
+    """(count, 3) placement offsets, cell apart: A row along +X, or a square-ish grid
+    (rows along +X, stacked down -Z: The front view reads like the image folder)"""
+    index = np.arange(count)
+    offsets = np.zeros((count, 3))
+    if layout == "ROW":
+        offsets[:, 0] = index * cell
+        return offsets
+    columns = max(int(np.ceil(np.sqrt(count))), 1)
+    offsets[:, 0] = (index % columns) * cell
+    offsets[:, 2] = -(index // columns) * cell
+    return offsets
+
+
+def chunk_parts(face_counts, max_faces=0):
+    """Consecutive part index groups of at most max_faces faces each (a part bigger
+    than that gets a group of its own). max_faces 0: All parts in one group"""
+    if not max_faces:
+        return [list(range(len(face_counts)))] if len(face_counts) else []
+    chunks = []
+    chunk = []
+    faces = 0
+    for i, count in enumerate(face_counts):
+        if chunk and faces + count > max_faces:
+            chunks.append(chunk)
+            chunk = []
+            faces = 0
+        chunk.append(i)
+        faces += count
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def merge_arrays(parts):
+    """Concatenate (verts, loops, loop_starts) mesh arrays into one mesh (no welding):
+    Returns verts, loops, loop_starts & the part index of each face"""
+    if not parts:
+        empty = np.zeros(0, dtype=np.int32)
+        return np.zeros((0, 3)), empty, empty, empty
+    vert_offsets = np.cumsum([0] + [len(p[0]) for p in parts])
+    loop_offsets = np.cumsum([0] + [len(p[1]) for p in parts])
+    verts = np.concatenate([p[0] for p in parts])
+    loops = np.concatenate([p[1] + o for p, o in zip(parts, vert_offsets)])
+    loop_starts = np.concatenate([p[2] + o for p, o in zip(parts, loop_offsets)])
+    faces = [len(p[2]) for p in parts]
+    source = np.repeat(np.arange(len(parts), dtype=np.int32), faces)
+    return verts, loops.astype(np.int32), loop_starts.astype(np.int32), source
@@ -0,0 +1,291 @@
+import numpy as np
+
+from .contour import ccw_triangles, outline_loops
+from .triangulate import hole_groups, signed_area, tessellate_loops
+
+# Quad corner offsets (u, v) in half-pixels, in face winding order
+QUAD_CORNERS = np.array(((-1, 1), (-1, -1), (1, -1), (1, 1)), dtype=np.float64)
+
+# Quad corners as steps on the pixel corner grid (pixel x, y = bottom-left corner)
+CORNER_STEPS = ((QUAD_CORNERS + 1) // 2).astype(np.int64)
+
+# Axis templates: (u axis, v axis, normal axis, centered)
+# The image u/v go to these 3d axes, centered images (Top) are offset on v and
+# placed at +w on the normal axis, the others sit on the origin plane.
+AXIS_PLANES = {
+    "Front": (0, 2, 1, False),
+    "Right": (1, 2, 0, False),
+    "Top": (0, 1, 2, True),
+}
+
+
+def corner_verts(cx, cy, scl, work_res, axis="Front"):
+    """(n, 3) vertex coords for pixel corner grid coords, placed by the axis template"""
+    u_axis, v_axis, n_axis, centered = AXIS_PLANES.get(axis, AXIS_PLANES["Front"])
+    s = scl * 0.5
+    w = (work_res * scl) * 0.5
+
+    # Each corner placed as the bottom-left corner of "its" pixel
+    u = cx * scl - w
+    v = cy * scl
+    if centered:
+        v -= w
+
+    verts = np.zeros((len(cx), 3))
+    verts[:, u_axis] = u - s
+    verts[:, v_axis] = v - s
+    if centered:
+        verts[:, n_axis] = w
+    return verts
+
+
+def corner_grid(pixel_xy):
+    """Shared corner grid of pixel quads: (v) corner x & y coords & (n * 4) face loop
+    vertex indices. Looked up in a table spanning only the used corners' bounds"""
+    count = len(pixel_xy)
+    corners = pixel_xy[:, None, :] + CORNER_STEPS
+    if count:
+        origin = corners.reshape(-1, 2).min(axis=0)
+        cols, rows = corners.reshape(-1, 2).max(axis=0) - origin + 1
+    else:
+        origin, cols, rows = np.zeros(2, dtype=np.int64), 1, 1
+    corners = corners - origin
+    keys = (corners[..., 0] * rows + corners[..., 1]).ravel()
+    used = np.zeros(cols * rows, dtype=bool)
+    used[keys] = True
+    index = np.cumsum(used, dtype=np.int32) - 1
+    loops = index[keys]
+    cx, cy = np.divmod(np.flatnonzero(used), rows)
+    return cx + origin[0], cy + origin[1], loops
+
+
+def grid_arrays(pixel_xy, scl, work_res, axis="Front"):
+    """Mesh arrays for one quad per pixel on a shared corner grid, so neighbouring
+    pixels share vertices and the mesh comes out welded (no remove_doubles needed):
+    (v, 3) vertex coords, (n * 4) face loop vertex indices & (n) face loop starts"""
+    cx, cy, loops = corner_grid(pixel_xy)
+    verts = corner_verts(cx, cy, scl, work_res, axis)
+    loop_starts = np.arange(0, len(pixel_xy) * 4, 4, dtype=np.int32)
+    return verts, loops, loop_starts
+
+
+def outline_arrays(mask, scl, work_res, axis="Front", tolerance=1.0, tessellate=None):
+    """Mesh arrays for the traced (& simplified) outline of a (width, height) bool mask,
+    filled with triangles: Cost scales with the perimeter instead of the pixel count.
+    tessellate: Faster single loop fill (e.g. mathutils' tessellate_polygon)"""
+    verts, loops, loop_starts, _ = fill_loops(
+        outline_loops(mask, tolerance), scl, work_res, axis, tessellate
+    )
+    return verts, loops, loop_starts
+
+
+def fill_triangles(loops, tessellate=None):
+    """(n, 3) triangles filling closed (k, 2) loops, indices into their concatenated
+    corners. tessellate gets one outer loop & its holes at a time: Given more, its
+    corners come back numbered in mathutils' scanfill order (polys sorted & merged).
+    Groups it doesn't fill right (degenerate input) go to the core's fill"""
+    if tessellate is None:
+        triangles = tessellate_loops([loop.tolist() for loop in loops])
+        return np.array(triangles, dtype=np.int32).reshape(-1, 3)
+    arrays = [np.asarray(loop, dtype=np.float64) for loop in loops]
+    areas = [signed_area(loop) for loop in arrays]
+    starts = np.cumsum([0] + [len(loop) for loop in arrays])
+    parts = [np.zeros((0, 3), dtype=np.int64)]
+    for outer, holes in hole_groups(arrays, areas).items():
+        group = [outer] + holes
+        polylines = [loops[n].tolist() for n in group]
+        triangles = np.array(tessellate(polylines), dtype=np.int64).reshape(-1, 3)
+        points = np.concatenate([arrays[n] for n in group])
+        a, b, c = (points[triangles[:, i]] for i in range(3))
+        filled = np.abs(
+            (b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1])
+            - (b[:, 1] - a[:, 1]) * (c[:, 0] - a[:, 0])
+        ).sum()
+        if not np.isclose(filled * 0.5, sum(areas[n] for n in group)):
+            triangles = np.array(tessellate_loops(polylines), dtype=np.int64)
+            triangles = triangles.reshape(-1, 3)
+        index = np.concatenate([np.arange(starts[n], starts[n + 1]) for n in group])
+        parts.append(index[triangles])
+    return np.concatenate(parts).astype(np.int32)
+
+
+def line_steps(points, a, b):
+    """Line ids & (reduced, sign fixed) steps of the lines through the points a & b"""
+    step = points[b] - points[a]
+    step //= np.maximum(np.gcd(step[:, 0], step[:, 1]), 1)[:, None]
+    step[(step[:, 0] < 0) | ((step[:, 0] == 0) & (step[:, 1] < 0))] *= -1
+    offset = step[:, 0] * points[a, 1] - step[:, 1] * points[a, 0]
+    _, line = np.unique(np.column_stack((step, offset)), axis=0, return_inverse=True)
+    return line.ravel(), step
+
+
+def split_t_junctions(points, triangles, sizes):
+    """Split (n, 3) triangles at the corners lying inside their unshared edges: The
+    fill leaves out straight corners (ones other triangles may already use), so
+    without this fills get T-junctions & don't meet the next tile's seam vertices.
+    points: (k, 2) integer corner coords of loops of the given sizes. A corner
+    inside an edge has an unshared edge along that line too, or it's left out of
+    the fill, on the line between its loop neighbours"""
+    points = np.round(points).astype(np.int64)
+    count = len(points)
+    pairs = np.stack((triangles, np.roll(triangles, -1, axis=1)), axis=-1)
+    a, b = pairs.reshape(-1, 2).T
+    unshared = np.flatnonzero(~np.isin(b * count + a, a * count + b))
+    a, b = a[unshared], b[unshared]
+    used = np.zeros(count, dtype=bool)
+    used[triangles] = True
+    unused = np.flatnonzero(~used)
+    starts = np.repeat(np.cumsum(sizes) - sizes, sizes)[unused]
+    size = np.repeat(sizes, sizes)[unused]
+    before = starts + (unused - starts - 1) % size
+    after = starts + (unused - starts + 1) % size
+
+    # Corners on lines: Unshared edge ends & left out (straight) corners
+    line, step = line_steps(
+        points, np.concatenate((a, before)), np.concatenate((b, after))
+    )
+    edges = len(a)
+    corner = np.concatenate((a, b, unused))
+    rows = np.r_[np.arange(edges), np.arange(edges), edges + np.arange(len(unused))]
+    offset = points[unused] - points[before]
+    straight = step[edges:, 0] * offset[:, 1] == step[edges:, 1] * offset[:, 0]
+    keep = np.r_[np.ones(2 * edges, dtype=bool), straight & step[edges:].any(axis=1)]
+    corner, rows = corner[keep], rows[keep]
+    along = (step[rows] * points[corner]).sum(axis=1)
+    lowest = along.min() if len(along) else 0
+    span = int(along.max() - lowest) + 1 if len(along) else 1
+    keys = line[rows] * span + along - lowest
+    # (Used corners first, among coincident ones)
+    order = np.lexsort((~used[corner], keys))
+    keys, pick = np.unique(keys[order], return_index=True)
+    corner = corner[order][pick]
+
+    # Corners strictly inside each edge, in edge order
+    start = (step[:edges] * points[a]).sum(axis=1)
+    stop = (step[:edges] * points[b]).sum(axis=1)
+    base = line[:edges] * span - lowest
+    low = np.searchsorted(keys, base + np.minimum(start, stop), "right")
+    high = np.searchsorted(keys, base + np.maximum(start, stop), "left")
+    inside = np.maximum(high - low, 0)
+    if not inside.any():
+        return triangles
+    edge = np.repeat(np.arange(edges), inside)
+    k = np.arange(len(edge)) - np.repeat(np.cumsum(inside) - inside, inside)
+    found = np.where(start[edge] < stop[edge], low[edge] + k, high[edge] - 1 - k)
+
+    spans = {}
+    first, last = a.tolist(), b.tolist()
+    for i, c in zip(edge.tolist(), corner[found].tolist()):
+        spans.setdefault((first[i], last[i]), []).append(c)
+    split = np.zeros(len(triangles), dtype=bool)
+    split[unshared[inside > 0] // 3] = True
+    queue = triangles[split].tolist()
+    result = []
+    while queue:
+        triangle = queue.pop()
+        for j in range(3):
+            run = spans.get((triangle[j], triangle[(j + 1) % 3]))
+            if run:
+                # Fan from the opposite corner, same winding
+                chain = [triangle[j]] + run + [triangle[(j + 1) % 3]]
+                opposite = triangle[(j + 2) % 3]
+                queue.extend([p, q, opposite] for p, q in zip(chain[:-1], chain[1:]))
+                break
+        else:
+            result.append(triangle)
+    result = np.array(result, dtype=np.int32).reshape(-1, 3)
+    return np.concatenate((triangles[~split], result)).astype(np.int32)
+
+
+def fill_loops(loops, scl, work_res, axis="Front", tessellate=None, offset=(0, 0)):
+    """Mesh arrays for closed (k, 2) corner coord loops filled with triangles, placed
+    at the offset (in pixels). Also returns the vertices' (v, 2) corner coords"""
+    if loops:
+        points = np.concatenate(loops)
+        triangles = ccw_triangles(points, fill_triangles(loops, tessellate))
+        triangles = split_t_junctions(
+            points, triangles, np.array([len(loop) for loop in loops])
+        )
+        # Drop corners left out of the fill (straight / degenerate corners)
+        used, triangles = np.unique(triangles, return_inverse=True)
+        points = points[used]
+        triangles = triangles.reshape(-1, 3).astype(np.int32)
+    else:
+        points = np.zeros((0, 2))
+        triangles = np.zeros((0, 3), dtype=np.int32)
+    points = points + offset
+    verts = corner_verts(points[:, 0], points[:, 1], scl, work_res, axis)
+    loop_starts = np.arange(0, triangles.size, 3, dtype=np.int32)
+    return verts, triangles.ravel(), loop_starts, points
+
+
+def flip_faces(loops, loop_starts):
+    """Face loops in reversed winding (as Mesh.flip_normals: 1st corner stays)"""
+    sizes = np.diff(np.append(loop_starts, len(loops)))
+    starts = np.repeat(loop_starts, sizes)
+    sizes = np.repeat(sizes, sizes)
+    corner = np.arange(len(loops)) - starts
+    return loops[starts + (sizes - corner) % sizes]
+
+
+def axis_material_index(normals, slots, vectors, angle):
+    """Material index per face from its (n, 3) normal: The slot of the 1st projector
+    vector facing it (dot < -angle), 0 where none does"""
+    if not len(slots):
+        return np.zeros(len(normals), dtype=np.int32)
+    facing = normals @ np.asarray(vectors, dtype=normals.dtype).T < -angle
+    first = facing.argmax(axis=1)
+    slots = np.asarray(slots, dtype=np.int32)
+    return np.where(facing.any(axis=1), slots[first], 0).astype(np.int32)
+
+
+def dissolve_straight_verts(verts, loops, loop_starts):
+    """Drop the vertices with 2 edges in line (the middle of a straight border
+    between 2 faces) from their faces, & the then unused vertices. Returns the verts,
+    loops & loop starts"""
+    sizes = np.diff(np.append(loop_starts, len(loops)))
+    face = np.repeat(np.arange(len(sizes)), sizes)
+    following = np.arange(1, len(loops) + 1)
+    following[loop_starts + sizes - 1] = loop_starts
+    # Unique (undirected) edges, vertex by vertex
+    a = np.minimum(loops, loops[following]).astype(np.int64)
+    b = np.maximum(loops, loops[following]).astype(np.int64)
+    keys = np.unique(a * len(verts) + b)
+    ends = np.concatenate(np.divmod(keys, len(verts)))
+    others = np.concatenate(np.divmod(keys, len(verts))[::-1])
+    order = np.argsort(ends, kind="stable")
+    ends, others = ends[order], others[order]
+    two = np.bincount(ends, minlength=len(verts)) == 2
+    pairs = two[ends]
+    middle = ends[pairs][::2]
+    sides = verts[others[pairs]].reshape(-1, 2, 3) - verts[middle][:, None]
+    cross = np.linalg.norm(np.cross(sides[:, 0], sides[:, 1]), axis=1)
+    lengths = np.linalg.norm(sides, axis=2).prod(axis=1)
+    straight = np.zeros(len(verts), dtype=bool)
+    straight[middle[cross <= 1e-9 * lengths]] = True
+
+    # (Faces left with less than 3 corners keep theirs)
+    keep = ~straight[loops]
+    short = np.bincount(face[keep], minlength=len(sizes)) < 3
+    straight[loops[short[face]]] = False
+    keep = ~straight[loops]
+    sizes = np.bincount(face[keep], minlength=len(sizes))
+    used = np.zeros(len(verts), dtype=bool)
+    used[loops[keep]] = True
+    index = np.cumsum(used) - 1
+    return verts[used], index[loops[keep]], np.cumsum(sizes) - sizes
+
+
+def weld_verts(verts, loops, candidates):
+    """Merge coincident vertices among the (v) bool candidates (e.g. tile seams).
+    Returns the remaining verts & the remapped face loops"""
+    idx = np.flatnonzero(candidates)
+    remap = np.arange(len(verts))
+    if len(idx):
+        _, first, inverse = np.unique(
+            verts[idx], axis=0, return_index=True, return_inverse=True
+        )
+        remap[idx] = idx[first][inverse.ravel()]
+    keep = remap == np.arange(len(verts))
+    new_index = (np.cumsum(keep) - 1).astype(np.int32)
+    return verts[keep], new_index[remap][loops]
@@ -0,0 +1,74 @@
+import numpy as np
+
+
+def color_neighbours(rgb, threshold):
+    """Per color: indices of the colors in the 3x3x3 (threshold sized) rgb cells around
+    it, so grouping only has to check nearby colors instead of the whole palette"""
+    if threshold <= 0:
+        return [np.zeros(0, dtype=np.int64)] * len(rgb)
+    # Slightly larger cells, so rounding can't push a color within threshold 2 cells away
+    cells = np.floor(rgb / (threshold * 1.000001)).astype(np.int64)
+    occupied, cell_index = np.unique(cells, axis=0, return_inverse=True)
+    cell_index = cell_index.ravel()
+    by_cell = np.argsort(cell_index, kind="stable")
+    bounds = np.searchsorted(cell_index[by_cell], np.arange(len(occupied) + 1))
+    members = {
+        tuple(cell): by_cell[bounds[n] : bounds[n + 1]]
+        for n, cell in enumerate(occupied.tolist())
+    }
+    offsets = [(x, y, z) for x in (-1, 0, 1) for y in (-1, 0, 1) for z in (-1, 0, 1)]
+    around = []
+    for x, y, z in occupied.tolist():
+        near = [members.get((x + i, y + j, z + k)) for i, j, k in offsets]
+        around.append(np.concatenate([n for n in near if n is not None]))
+    return [around[n] for n in cell_index]
+
+
+def reduce_colors(colors, threshold=0.51, cap=None):
+    """Palette quantisation of (n, 4) pixel colors.
+    Opaque colors are grouped greedily, most common first (ties in order of appearance):
+    Each color not yet in a group starts a new one, claiming all ungrouped colors
+    within +/- threshold (exclusive) on r, g & b. With a cap, only the cap most common
+    colors are grouped. Grouped pixels are remapped to their group (leader) color.
+    Returns remapped colors, the palette (list of color tuples) & per-pixel palette
+    indices (-1 for pixels left as they are)"""
+    opaque = colors[:, 3] == 1
+    palette_index = np.full(len(colors), -1, dtype=np.int32)
+    if not opaque.any():
+        return colors, [], palette_index
+
+    unique, first, inverse, counts = np.unique(
+        colors[opaque],
+        axis=0,
+        return_index=True,
+        return_inverse=True,
+        return_counts=True,
+    )
+    order = np.lexsort((first, -counts))
+    if cap is not None:
+        order = order[:cap]
+
+    rgb = unique[order, :3].astype(np.float64)
+    ungrouped = np.ones(len(order), dtype=bool)
+    group = np.full(len(unique), -1, dtype=np.int32)
+    leaders = []
+    neighbours = color_neighbours(rgb, threshold)
+    for i in range(len(order)):
+        if not ungrouped[i]:
+            continue
+        c = rgb[i]
+        near = neighbours[i]
+        near = near[ungrouped[near]]
+        inside = (rgb[near] > c - threshold) & (rgb[near] < c + threshold)
+        near = near[np.all(inside, axis=1)]
+        near = np.append(near, i)
+        ungrouped[near] = False
+        group[order[near]] = len(leaders)
+        leaders.append(order[i])
+
+    palette = unique[leaders]
+    palette_index[opaque] = group[inverse.ravel()]
+    grouped = palette_index >= 0
+    colors = colors.copy()
+    colors[grouped] = palette[palette_index[grouped]]
+    return colors, [tuple(c) for c in palette.tolist()], palette_index
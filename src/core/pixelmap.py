@@ -0,0 +1,108 @@
+import numpy as np
+
+# Blender hands out float32 pixels, but the thresholds are computed in double precision.
+# Comparing a float32 array against a Python float would round the threshold to float32
+# and flip pixels sitting right on the border, so the bounds are snapped to the nearest
+# float32 that gives the same answer as the double precision comparison would.
+
+
+def ge_bound(value):
+    """Smallest float32 f where f >= value (in double precision)"""
+    f = np.float32(value)
+    if float(f) < value:
+        f = np.nextafter(f, np.float32(np.inf))
+    return f
+
+
+def gt_bound(value):
+    """Smallest float32 f where f > value (in double precision)"""
+    f = np.float32(value)
+    if float(f) <= value:
+        f = np.nextafter(f, np.float32(np.inf))
+    return f
+
+
+def lt_bound(value):
+    """Largest float32 f where f < value (in double precision)"""
+    f = np.float32(value)
+    if float(f) >= value:
+        f = np.nextafter(f, np.float32(-np.inf))
+    return f
+
+
+def as_rgba(pixels, width, height):
+    """(height, width, 4) float32 view of a flat RGBA pixel sequence"""
+    return np.asarray(pixels, dtype=np.float32).reshape(height, width, 4)
+
+
+def rgb_match(rgba, rgb, tolerance):
+    """Pixels inside the user RGB window (+/- tolerance, exclusive)"""
+    match = np.ones(rgba.shape[:2], dtype=bool)
+    for c in range(3):
+        channel = rgba[..., c]
+        match &= channel >= gt_bound(rgb[c] - tolerance)
+        match &= channel <= lt_bound(rgb[c] + tolerance)
+    return match
+
+
+def opaque_mask(rgba, tolerance, rgb=None, start=0, stop=None):
+    """Thresholded mask of the pixels that become faces, in (width, height) order.
+    Alpha >= tolerance, or - if rgb is given - any color outside the rgb window"""
+    window = rgba[:, start:stop]
+    if rgb is None:
+        mask = window[..., 3] >= ge_bound(tolerance)
+    else:
+        mask = ~rgb_match(window, rgb, tolerance)
+    return mask.T
+
+
+def dilate_axis(mask, radius, axis):
+    """Grow a bool mask by radius pixels along one axis.
+    Distance to the nearest set pixel on either side via running max/min of indices,
+    so the cost is the same for any radius"""
+    n = mask.shape[axis]
+    shape = [1] * mask.ndim
+    shape[axis] = n
+    idx = np.arange(n, dtype=np.int32).reshape(shape)
+    far = np.int32(n + radius + 1)
+    before = np.maximum.accumulate(np.where(mask, idx, -far), axis=axis)
+    after = np.where(mask, idx, n + far)
+    after = np.flip(np.minimum.accumulate(np.flip(after, axis), axis=axis), axis)
+    return (idx - before <= radius) | (after - idx <= radius)
+
+
+def dilate(mask, radius):
+    """Morphological dilation of a 2d bool mask with a (2 * radius + 1)^2 square,
+    as two separable 1d passes"""
+    if radius <= 0:
+        return mask.copy()
+    return dilate_axis(dilate_axis(mask, radius, 0), radius, 1)
+
+
+def dilate_pixels(rgba, radius, tolerance, rgb=None, start=0, stop=None):
+    """Expand Border: Returns a copy of rgba where everything within radius pixels of
+    an opaque pixel is made opaque (alpha = 1) - or, using rgb, made black"""
+    source = np.zeros(rgba.shape[:2], dtype=bool)
+    source[:, start:stop] = opaque_mask(rgba, tolerance, rgb, start, stop).T
+    grown = dilate(source, radius)
+    rgba = rgba.copy()
+    if rgb is None:
+        rgba[grown, 3] = 1
+    else:
+        rgba[grown, :3] = 0
+    return rgba
+
+
+def pixel_arrays(rgba, tolerance, rgb=None, start=0, stop=None):
+    """Flat pixel map: (n, 2) int pixel coords (x, y) & (n, 4) float32 colors.
+    Ordered column by column, same as the old per-pixel w/h loops"""
+    cols, rows = np.nonzero(opaque_mask(rgba, tolerance, rgb, start, stop))
+    cols += start
+    return np.column_stack((cols, rows)), rgba[rows, cols]
+
+
+def pixel_mask(pixel_xy, width, height):
+    """(width, height) bool mask of the pixels in a pixel map"""
+    mask = np.zeros((width, height), dtype=bool)
+    mask[pixel_xy[:, 0], pixel_xy[:, 1]] = True
+    return mask
@@ -0,0 +1,124 @@
+import numpy as np
+
+from .contour import simplify_loop, trace_outlines, uncrossed_loops
+from .mesh import corner_grid, corner_verts, fill_loops, weld_verts
+from .pixelmap import dilate_pixels, pixel_arrays, pixel_mask
+
+
+def tile_grid(work_res, tile_size):
+    """(x, y, width, height) of the tiles covering the work res square, column-wise"""
+    return [
+        (x, y, min(tile_size, work_res - x), min(tile_size, work_res - y))
+        for x in range(0, work_res, tile_size)
+        for y in range(0, work_res, tile_size)
+    ]
+
+
+def tile_pixels(work, tile, tolerance, rgb=None, dilation=0, window=None):
+    """Pixel coords (on the whole work res grid) & colors of one tile's mask.
+    work: The (work_res, work_res, 4) work image, sliced (not copied) per tile with
+    a dilation sized overlap, so the dilated mask is the same as it would be for the
+    whole image. window: (start, stop) columns"""
+    work_res = work.shape[1]
+    x, y, width, height = tile
+    start, stop = window if window is not None else (0, work_res)
+    x0, y0 = max(x - dilation, 0), max(y - dilation, 0)
+    x1 = min(x + width + dilation, work_res)
+    y1 = min(y + height + dilation, work_res)
+    rgba = work[y0:y1, x0:x1]
+    if dilation != 0:
+        rgba = dilate_pixels(
+            rgba,
+            dilation,
+            tolerance,
+            rgb,
+            start=min(max(start - x0, 0), x1 - x0),
+            stop=min(max(stop - x0, 0), x1 - x0),
+        )
+    rgba = rgba[y - y0 : y - y0 + height, x - x0 : x - x0 + width]
+    pixel_xy, colors = pixel_arrays(
+        rgba,
+        tolerance,
+        rgb,
+        start=min(max(start - x, 0), width),
+        stop=min(max(stop - x, 0), width),
+    )
+    pixel_xy += (x, y)
+    return pixel_xy, colors
+
+
+def seam_lines(tile, work_res):
+    """Corner grid x & y coords of a tile's borders shared with other tiles"""
+    x, y, width, height = tile
+    xs = [c for c in (x, x + width) if 0 < c < work_res]
+    ys = [c for c in (y, y + height) if 0 < c < work_res]
+    return xs, ys
+
+
+def on_seam(cx, cy, tile, work_res):
+    xs, ys = seam_lines(tile, work_res)
+    return np.isin(cx, xs) | np.isin(cy, ys)
+
+
+def split_seam_edges(loop, xs, ys):
+    """Loop corners with every corner grid point added along edges on the seam lines,
+    so tiles on both sides of a seam get the same vertices there"""
+    following = np.roll(loop, -1, axis=0)
+    step = following - loop
+    length = np.abs(step).sum(axis=1)
+    seam = ((step[:, 0] == 0) & np.isin(loop[:, 0], xs)) | (
+        (step[:, 1] == 0) & np.isin(loop[:, 1], ys)
+    )
+    counts = np.where(seam, length, 1)
+    edge = np.repeat(np.arange(len(loop)), counts)
+    offset = np.arange(len(edge)) - np.repeat(np.cumsum(counts) - counts, counts)
+    direction = np.sign(step)
+    return loop[edge] + direction[edge] * offset[:, None]
+
+
+def tile_mesh_arrays(
+    pixel_xy, tile, work_res, scl, axis="Front", outline_tolerance=None, tessellate=None
+):
+    """Mesh arrays of one tile: Pixel quads, or the filled outline with a tolerance.
+    Also returns a (v) bool seam flag per vertex: Seam vertices must stay in place
+    (reduction) so they can be welded to the next tiles' afterwards"""
+    if outline_tolerance is None:
+        cx, cy, loops = corner_grid(pixel_xy)
+        verts = corner_verts(cx, cy, scl, work_res, axis)
+        loop_starts = np.arange(0, len(pixel_xy) * 4, 4, dtype=np.int32)
+        return verts, loops, loop_starts, on_seam(cx, cy, tile, work_res)
+
+    x, y, width, height = tile
+    xs, ys = seam_lines(tile, work_res)
+    local_xs = [c - x for c in xs]
+    local_ys = [c - y for c in ys]
+    mask = pixel_mask(pixel_xy - (x, y), width, height)
+    traced = []
+    loops = []
+    for loop in trace_outlines(mask):
+        loop = split_seam_edges(loop, local_xs, local_ys)
+        pinned = np.isin(loop[:, 0], local_xs) | np.isin(loop[:, 1], local_ys)
+        traced.append(loop)
+        loops.append(simplify_loop(loop, outline_tolerance, keep=pinned))
+    loops = uncrossed_loops(traced, loops)
+    verts, loops, loop_starts, points = fill_loops(
+        loops, scl, work_res, axis, tessellate, offset=(x, y)
+    )
+    seam = on_seam(points[:, 0], points[:, 1], tile, work_res)
+    return verts, loops, loop_starts, seam
+
+
+def stitch_tiles(parts):
+    """Join (verts, loops, loop_starts, seam) tile mesh arrays into one mesh,
+    welding the tiles' seam vertices"""
+    if not parts:
+        empty = np.zeros(0, dtype=np.int32)
+        return np.zeros((0, 3)), empty, empty
+    vert_offsets = np.cumsum([0] + [len(p[0]) for p in parts])
+    loop_offsets = np.cumsum([0] + [len(p[1]) for p in parts])
+    verts = np.concatenate([p[0] for p in parts])
+    loops = np.concatenate([p[1] + o for p, o in zip(parts, vert_offsets)])
+    loop_starts = np.concatenate([p[2] + o for p, o in zip(parts, loop_offsets)])
+    seam = np.concatenate([p[3] for p in parts])
+    verts, loops = weld_verts(verts, loops, seam)
+    return verts, loops.astype(np.int32), loop_starts.astype(np.int32)
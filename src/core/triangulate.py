@@ -0,0 +1,168 @@
+import numpy as np
+
+
+def signed_area(points):
+    """Signed area of a closed (k, 2) loop, positive for counter-clockwise"""
+    x, y = points[:, 0], points[:, 1]
+    return 0.5 * float(np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y))
+
+
+def orient(a, b, c):
+    """Cross product (b - a) x (c - a): > 0 when a, b, c turn left"""
+    return (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+
+
+def inside_loop(point, points):
+    """Even-odd point in (k, 2) loop test"""
+    x, y = point
+    a = points
+    b = np.roll(points, -1, axis=0)
+    crosses = (a[:, 1] > y) != (b[:, 1] > y)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        at_x = a[:, 0] + (y - a[:, 1]) * (b[:, 0] - a[:, 0]) / (b[:, 1] - a[:, 1])
+    return bool(np.count_nonzero(crosses & (x < at_x)) % 2)
+
+
+def segment_blocked(p, q, starts, ends):
+    """Does the segment p-q cross any of the (n, 2) edges, or run through an edge corner"""
+    if not len(starts):
+        return False
+    d1 = (q[0] - p[0]) * (starts[:, 1] - p[1]) - (q[1] - p[1]) * (starts[:, 0] - p[0])
+    d2 = (q[0] - p[0]) * (ends[:, 1] - p[1]) - (q[1] - p[1]) * (ends[:, 0] - p[0])
+    e = ends - starts
+    d3 = e[:, 0] * (p[1] - starts[:, 1]) - e[:, 1] * (p[0] - starts[:, 0])
+    d4 = e[:, 0] * (q[1] - starts[:, 1]) - e[:, 1] * (q[0] - starts[:, 0])
+    if np.any((d1 * d2 < 0) & (d3 * d4 < 0)):
+        return True
+    # Edge corners lying on the open segment (collinear touches)
+    corners = np.concatenate((starts[d1 == 0], ends[d2 == 0]))
+    if not len(corners):
+        return False
+    t = (corners - p) @ (q - p) / float((q - p) @ (q - p))
+    return bool(np.any((t > 0) & (t < 1)))
+
+
+def in_wedge(prev, corner, next, point):
+    """Is the direction corner -> point inside the (CCW) polygon angle at corner"""
+    left_in = orient(prev, corner, point) > 0
+    left_out = orient(corner, next, point) > 0
+    if orient(prev, corner, next) >= 0:
+        return left_in and left_out
+    return left_in or left_out
+
+
+def bridge_hole(points, ring, hole, blockers):
+    """Splice a (CW) hole into a (CCW) ring of point indices, through a bridge edge
+    from the hole's rightmost corner to the nearest visible ring corner"""
+    m = hole[int(np.argmax(points[hole, 0]))]
+    start = hole.index(m)
+    hole = hole[start:] + hole[:start]
+    ring_xy = points[ring]
+    starts, ends = blockers
+    for j in np.argsort(((ring_xy - points[m]) ** 2).sum(axis=1), kind="stable"):
+        p = ring[j]
+        if segment_blocked(points[m], points[p], starts, ends):
+            continue
+        prev, next = ring[j - 1], ring[(j + 1) % len(ring)]
+        if not in_wedge(points[prev], points[p], points[next], points[m]):
+            continue
+        return ring[: j + 1] + hole + [m, p] + ring[j + 1 :], (m, p)
+    # No visible corner (overlapping loops): Keep the hole out
+    return ring, None
+
+
+def clip_ears(points, ring):
+    """Ear clipping triangulation of a CCW ring of point indices. The ring may touch
+    itself (hole bridges, diagonal pixels), so an ear also needs its diagonal to
+    stay inside the ring: Not crossing it & leaving both ends into the ring's angle"""
+    ring = list(ring)
+    triangles = []
+    i = 0
+    misses = 0
+    while len(ring) > 3:
+        count = len(ring)
+        i %= count
+        z, a, b, c = ring[i - 2], ring[i - 1], ring[i], ring[(i + 1) % count]
+        pa, pb, pc = points[a], points[b], points[c]
+        turn = orient(pa, pb, pc)
+        if turn == 0:
+            # Straight (or folded back) corner: No area to fill
+            del ring[i]
+            misses = 0
+            continue
+        ear = turn > 0
+        if ear:
+            xy = points[ring].T
+            inside = (
+                (orient(pa, pb, xy) > 0)
+                & (orient(pb, pc, xy) > 0)
+                & (orient(pc, pa, xy) > 0)
+            )
+            ear = not inside.any()
+        if ear:
+            ear = in_wedge(points[z], pa, pb, pc)
+        if ear:
+            xy = points[ring]
+            ear = not segment_blocked(pa, pc, xy, np.roll(xy, -1, axis=0))
+        if ear or misses >= count:
+            # (Forced when no ear is left, on degenerate input)
+            if turn > 0:
+                triangles.append((a, b, c))
+            del ring[i]
+            misses = 0
+        else:
+            i += 1
+            misses += 1
+    if len(ring) == 3 and orient(*points[ring]) > 0:
+        triangles.append(tuple(ring))
+    return triangles
+
+
+def hole_groups(arrays, areas):
+    """Outer (CCW) loop index -> its hole (CW) loop indices, of (k, 2) loop arrays
+    & their signed areas. Each hole goes to the smallest outer loop around it"""
+    outers = [n for n, area in enumerate(areas) if area > 0]
+    holes = {n: [] for n in outers}
+    for n, area in enumerate(areas):
+        if area >= 0:
+            continue
+        a, b = arrays[n][0], arrays[n][1]
+        # Just left of a hole edge = filled side
+        mid = (a + b) * 0.5
+        probe = mid + np.array((b[1] - a[1], a[0] - b[0])) * -1e-3
+        around = [o for o in outers if inside_loop(probe, arrays[o])]
+        if around:
+            holes[min(around, key=lambda o: areas[o])].append(n)
+    return holes
+
+
+def tessellate_loops(loops):
+    """Triangles filling closed loops of (x, y) coords: CCW outer loops with CW holes,
+    loops nested in holes make new islands. Same use as mathutils' tessellate_polygon:
+    Returns (a, b, c) index triples into the loops' coords, concatenated"""
+    arrays = [np.asarray(loop, dtype=np.float64).reshape(-1, 2) for loop in loops]
+    if not arrays:
+        return []
+    points = np.concatenate(arrays)
+    bounds = np.cumsum([0] + [len(a) for a in arrays])
+    rings = [list(range(bounds[n], bounds[n + 1])) for n in range(len(arrays))]
+    holes = hole_groups(arrays, [signed_area(a) for a in arrays])
+
+    triangles = []
+    for n in holes:
+        ring = rings[n]
+        if holes[n]:
+            edges = [
+                (r, np.roll(r, -1)) for r in (rings[h] for h in [n] + holes[n])
+            ]
+            starts = points[np.concatenate([e[0] for e in edges])]
+            ends = points[np.concatenate([e[1] for e in edges])]
+            order = sorted(holes[n], key=lambda h: -arrays[h][:, 0].max())
+            for h in order:
+                ring, bridge = bridge_hole(points, ring, rings[h], (starts, ends))
+                if bridge is not None:
+                    # Later bridges can't cross this one
+                    starts = np.vstack((starts, points[bridge[0]]))
+                    ends = np.vstack((ends, points[bridge[1]]))
+        triangles.extend(clip_ears(points, ring))
+    return triangles
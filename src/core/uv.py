@@ -0,0 +1,56 @@
+import numpy as np
+
+# UV projector (empty) rotations, Euler XYZ, per axis
+PROJECTOR_ROTATIONS = {
+    "Front": (1.5707963, 0, 0),
+    "Right": (-1.5707963, 3.1415926, -1.5707963),
+    "Top": (0, 0, 1.5707963),
+    "Back": (-1.5707963, 3.1415926, 0),
+    "Left": (1.5707963, 0, -1.5707963),
+    "Bottom": (-3.1415926, 0, 1.5707963),
+}
+
+
+def euler_matrix(rotation):
+    """3x3 rotation matrix of an XYZ Euler rotation (as Blender's Euler.to_matrix)"""
+    cx, cy, cz = np.cos(rotation)
+    sx, sy, sz = np.sin(rotation)
+    rx = np.array(((1, 0, 0), (0, cx, -sx), (0, sx, cx)))
+    ry = np.array(((cy, 0, sy), (0, 1, 0), (-sy, 0, cy)))
+    rz = np.array(((cz, -sz, 0), (sz, cz, 0), (0, 0, 1)))
+    return rz @ ry @ rx
+
+
+def projector_matrix(rotation, scale, location):
+    """4x4 (location @ rotation @ scale) matrix of a projector"""
+    matrix = np.identity(4)
+    matrix[:3, :3] = euler_matrix(rotation) * np.asarray(scale, dtype=np.float64)
+    matrix[:3, 3] = location
+    return matrix
+
+
+def project_uvs(verts, loops, loop_starts, normals, projectors):
+    """Per loop (n, 2) UVs, as the UV Project modifier makes them: Each face is mapped
+    by the projector (4x4 matrix, same space as the verts) its normal faces the most,
+    the projector's -1..1 xy square to the 0..1 UV square"""
+    offset = np.identity(4)
+    offset[:3, :3] *= 0.5
+    offset[:3, 3] = 0.5
+    matrices = [offset @ np.linalg.inv(p) for p in projectors]
+
+    if len(projectors) > 1:
+        # Projector normal: Its (scaled) Z axis, the highest dot product wins
+        axes = np.array([p[:3, 2] for p in projectors])
+        best = np.argmax(normals @ axes.T, axis=1)
+    else:
+        best = np.zeros(len(loop_starts), dtype=np.int64)
+    sizes = np.diff(np.append(loop_starts, len(loops)))
+    best = np.repeat(best, sizes)
+
+    uvs = np.empty((len(loops), 2), dtype=np.float32)
+    coords = np.asarray(verts, dtype=np.float64)
+    for j, matrix in enumerate(matrices):
+        selected = best == j
+        co = coords[loops[selected]]
+        uvs[selected] = co @ matrix[:2, :3].T + matrix[:2, 3]
+    return uvs
@@ -0,0 +1,118 @@
+import hashlib
+import json
+import os
+import zipfile
+import zlib
+import bpy
+import numpy as np
+
+# Partial files being written (by this or a parallel batch worker)
+TEMP_SUFFIX = ".tmp.npz"
+
+# File content hashes, by (path, mtime, size) - so unchanged files are only read once
+_file_hashes = {}
+
+
+def cache_dir():
+    return bpy.utils.user_resource("CONFIG", path="kei2m_cache", create=True)
+
+
+def file_hash(path):
+    """sha256 of a file's contents (memoised while the file is unchanged)"""
+    stat = os.stat(path)
+    ident = (path, stat.st_mtime, stat.st_size)
+    if ident not in _file_hashes:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1048576), b""):
+                h.update(block)
+        _file_hashes[ident] = h.hexdigest()
+    return _file_hashes[ident]
+
+
+def cache_key(img, params):
+    """Key for an image's converted mesh: image file contents + conversion params.
+    None (not cached) for packed, generated or unsaved (painted) images"""
+    if img.packed_file or img.is_dirty or img.source != "FILE":
+        return None
+    path = bpy.path.abspath(img.filepath)
+    if not os.path.isfile(path):
+        return None
+    text = file_hash(path) + json.dumps(params, sort_keys=True)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def load(key):
+    """Cached arrays (dict) for the key, or None"""
+    if key is None:
+        return None
+    path = os.path.join(cache_dir(), key + ".npz")
+    if not os.path.isfile(path):
+        return None
+    try:
+        with np.load(path) as data:
+            arrays = {name: data[name] for name in data.files}
+    except (OSError, ValueError, EOFError, KeyError, zipfile.BadZipFile, zlib.error):
+        # Damaged / truncated file
+        remove(path)
+        return None
+    # Mark as recently used (eviction goes by mtime)
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return arrays
+
+
+def save(key, arrays, limit):
+    """Store arrays (dict) under the key, then trim the cache to limit (bytes)"""
+    if key is None:
+        return
+    folder = cache_dir()
+    # (Per process: Parallel workers may write the same key)
+    tmp = os.path.join(folder, "%s.%d%s" % (key, os.getpid(), TEMP_SUFFIX))
+    np.savez(tmp, **arrays)
+    os.replace(tmp, os.path.join(folder, key + ".npz"))
+    evict(limit)
+
+
+def remove(path):
+    """Remove a cache file, if not already gone (parallel workers share the cache)"""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def entries():
+    """The cache's finished .npz entries (os.DirEntry), without partial temp files"""
+    for entry in os.scandir(cache_dir()):
+        if entry.name.endswith(".npz") and not entry.name.endswith(TEMP_SUFFIX):
+            yield entry
+
+
+def evict(limit):
+    """Remove least recently used entries until the cache fits in limit (bytes)"""
+    stats = []
+    for entry in entries():
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+        stats.append((stat.st_mtime, stat.st_size, entry.path))
+    size = sum(e[1] for e in stats)
+    for mtime, entry_size, path in sorted(stats):
+        if size <= limit:
+            break
+        remove(path)
+        size -= entry_size
+
+
+def clear():
+    """Remove all cached meshes, returns the number of entries removed"""
+    count = 0
+    for entry in entries():
+        remove(entry.path)
+        count += 1
+    _file_hashes.clear()
+    return count
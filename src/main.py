@@ -1,9 +1,15 @@
 import bpy
 import bmesh
+import hashlib
+import json
+import os
 import sys
-import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 from bpy.types import Operator
 from mathutils import Vector, Matrix
+from mathutils.geometry import tessellate_polygon
 from bpy.props import (
     BoolProperty,
     FloatProperty,
@@ -11,7 +17,55 @@ from bpy.props import (
     IntProperty,
 )
 
-from .utilities import alpha_check, is_bversion, make_entry, reduce_colors
+from .core import (
+    PROJECTOR_ROTATIONS,
+    as_rgba,
+    axis_material_index,
+    flip_faces,
+    hull_arrays,
+    mask_pixels,
+    mesh_arrays,
+    opacity_tolerance,
+    pixel_mask,
+    project_uvs,
+    projector_matrix,
+    reduce_colors,
+    screw_window,
+    stitch_tiles,
+    tile_grid,
+    tile_mesh_arrays,
+    tile_pixels,
+)
+from . import diskcache
+from .materials import color_material, image_material
+from .profiler import Profiler, reports, write_report
+from .cache import batch_meshes, image_key, stage_cache, stage_key
+from .utilities import (
+    alpha_check,
+    apply_modifiers,
+    fill_mesh,
+    is_bversion,
+    kei2m_version,
+    process_peak_rss,
+    read_mesh_arrays,
+    read_pixels,
+    read_vertex_colors,
+    write_vertex_colors,
+)
+
+# Operator settings that change the cleaned up component meshes (disk cache key)
+DISK_CACHE_PARAMS = (
+    "opacity",
+    "dilation",
+    "reduce",
+    "outline_tolerance",
+    "c2threshold",
+    "c2m_smooth",
+    "vcolor",
+    "vcthreshold",
+    "screw_flip",
+    "tile_size",
+)
 
 
 class KeI2M(Operator):
@@ -56,6 +110,19 @@ class KeI2M(Operator):
         description="Non-zero value will override Work Resolution X & Y sizes",
     )
 
+    tile_size: IntProperty(
+        min=0,
+        max=65536,
+        default=0,
+        name="Tile Size",
+        soft_min=0,
+        soft_max=0,
+        description="Non-zero: Work Resolutions above this are processed in tiles of this\n"
+        "size (pixels), stitched along the tile seams. The mesh data (the bulk of the\n"
+        "memory) is bound by the tile size; the work res image is read once and sliced.\n"
+        "(Not used in Vertex Color & Color 2 Material)",
+    )
+
     screw_flip: BoolProperty(
         default=False,
         name="Flip Screw Source-Side",
@@ -77,6 +144,7 @@ class KeI2M(Operator):
             ("SIMPLE", "Simple", "", "", 2),
             ("DISSOLVE", "Dissolve", "", "", 3),
             ("NONE", "None", "", "", 4),
+            ("OUTLINE", "Outline", "", "", 5),
         ],
         name="Mesh Reduction",
         default="SIMPLE",
@@ -84,7 +152,20 @@ class KeI2M(Operator):
         "Reduced: No Smoothing & high polycount\n"
         "Simple: Low smoothing & high polycount\n"
         "Dissolve: Low polycount & high smoothness & reduction, slow\n"
-        "None: Fast, but VERY high polycount. 1 workpixel = 1 face!\n",
+        "None: Fast, but VERY high polycount. 1 workpixel = 1 face!\n"
+        "Outline: Traces & fills the alpha border directly. Lowest polycount,\n"
+        "fast even at very high work res (triangulated)",
+    )
+
+    outline_tolerance: FloatProperty(
+        min=0,
+        max=16,
+        default=1,
+        name="Outline Tolerance",
+        soft_min=1,
+        soft_max=1,
+        description="Max. deviation (in work res pixels) of the simplified outline\n"
+        "from the traced pixel border. Zero = Keep all pixel border corners",
     )
 
     c2m_reduce: EnumProperty(
@@ -154,6 +235,29 @@ class KeI2M(Operator):
         "For debugging & troubleshooting mostly",
     )
 
+    bool_engine: EnumProperty(
+        items=[
+            ("VOXEL", "Voxel Hull", "", "", 1),
+            ("MODIFIER", "Modifiers", "", "", 2),
+        ],
+        name="Boolean Engine",
+        default="MODIFIER",
+        description="How the Boolean Geo Mode intersects the silhouettes:\n"
+        "Voxel Hull: Intersects the images' masks in a work res voxel grid & builds\n"
+        "the surface directly. No boolean solver failures, but the cost grows with\n"
+        "the work res cubed\n"
+        "Modifiers: Solidify & (exact) Boolean modifiers. Also used with Vertex Color",
+    )
+
+    live_uv: BoolProperty(
+        default=False,
+        name="Live UV Projection",
+        description="Projects the UVs with a UV Project modifier & (hidden) projector\n"
+        "empties, for live uv projection modeling. Off: The same projection is written\n"
+        "to the UV map directly, no modifier or empties.\n"
+        "(Always live with an unapplied Screw, or unapplied Boolean modifiers)",
+    )
+
     angle: FloatProperty(
         min=0,
         max=0.9,
@@ -196,7 +300,7 @@ class KeI2M(Operator):
         soft_max=0,
         description="Tolerance for color separation / reduction (anti-aliasing removal)\n"
         "0 = No limit (full rgb) in Vertex Color Mode (Also Faster)\n"
-        "Sensitive: Increase by steps of 0.05 (Also, very slow!)\n"
+        "Sensitive: Increase by steps of 0.05 (Slower, esp. with tiny values)\n"
         "Do not use as slider! Use keyboard input!",
     )
 
@@ -207,7 +311,7 @@ class KeI2M(Operator):
         name="Expand Border",
         soft_min=0,
         soft_max=0,
-        description="Using a simple brute force dilation on the alpha (in pixels, roughly),\n"
+        description="Dilation (morphological, square) on the alpha, in pixels,\n"
         "expanding it beyond the original image alpha borders. Zero to disable.\n"
         "Tip: Tweak Tolerance value 1st - only use EB if necessary",
     )
@@ -249,8 +353,6 @@ class KeI2M(Operator):
 
     coll = None
     wm = None
-    t = 0
-    tot = 0
     img_count = 0
     flip_left = False
     flip_back = False
@@ -262,6 +364,12 @@ class KeI2M(Operator):
     color_cap = 16
     geo = "PLANE"
     c2m = False
+    mask_key = None
+    object_materials = False
+    material_count = 0
+    disk_cache = False
+    disk_cache_size = 0
+    profiler = None
 
     @classmethod
     def poll(cls, context):
@@ -294,6 +402,8 @@ class KeI2M(Operator):
             layout.prop(self, "workres")
 
         layout.prop(self, "custom_workres")
+        if not (self.vcolor or c2m_mode):
+            layout.prop(self, "tile_size")
         # if self.geo != "BOOLEAN":
         layout.separator(factor=0.5)
         layout.prop(self, "size", expand=True)
@@ -305,6 +415,8 @@ class KeI2M(Operator):
 
         if not self.vcolor:
             layout.prop(self, "reduce", expand=True)
+            if self.reduce == "OUTLINE" and not c2m_mode:
+                layout.prop(self, "outline_tolerance")
             layout.separator(factor=0.5)
 
         # mode specifics
@@ -319,6 +431,7 @@ class KeI2M(Operator):
             layout.prop(self, "screw_flip", toggle=True)
             layout.separator(factor=0.5)
         elif k.geo == "BOOLEAN":
+            layout.prop(self, "bool_engine", expand=True)
             layout.prop(self, "angle")
             layout.prop(self, "front_only", toggle=True)
             layout.separator(factor=0.5)
@@ -333,7 +446,9 @@ class KeI2M(Operator):
         if not c2m_mode:
             if not self.vcolor:
                 layout.prop(self, "qnd_mat", toggle=True)
-            if not self.apply and k.geo == "BOOLEAN":
+                layout.prop(self, "live_uv", toggle=True)
+            modifiers = self.bool_engine == "MODIFIER" or self.vcolor
+            if not self.apply and k.geo == "BOOLEAN" and modifiers:
                 layout.prop(self, "apply_none", toggle=True)
             if not self.apply_none:
                 layout.prop(self, "apply", toggle=True)
@@ -342,162 +457,391 @@ class KeI2M(Operator):
         row.operator("wm.operator_defaults", icon="FILE_REFRESH", text="Reset")
         layout.separator()
 
-    def make_pixel_map(self, width, height, pixels, scl, use_rgb=False):
-        pixel_map = []
-        width_range = width
-        start = 0
+    def make_pixel_map(self, width, height, pixels, use_rgb=False, key=None):
+        start, stop = 0, width
         if self.geo == "SCREW":
-            if not self.screw_flip:
-                width_range = int(width / 2)
-            else:
-                start = int(width / 2)
-
-        tolerance = float(self.opacity / 100)
-        # hard to find opc value that "feels" good here...
-        opc = self.opacity * 0.5
-        tol = float(opc / 100)
-        rmin = self.rgb[0] - tol
-        rmax = self.rgb[0] + tol
-        gmin = self.rgb[1] - tol
-        gmax = self.rgb[1] + tol
-        bmin = self.rgb[2] - tol
-        bmax = self.rgb[2] + tol
-
-        if self.dilation != 0:
-            # Dilate alpha border
-            tot = len(pixels)
-            pm_dilated = list(pixels)
-
-            for w in range(start, width_range):
-                for h in range(0, height):
-                    rgba = make_entry(h, width, w, pixels)
-                    if use_rgb:
-                        if (
-                            rmin < rgba[0] < rmax
-                            and gmin < rgba[1] < gmax
-                            and bmin < rgba[2] < bmax
-                        ):
-                            pass
-                        else:
-                            for dx in range(-self.dilation, self.dilation):
-                                for dy in range(-self.dilation, self.dilation):
-                                    i = (((h + dy) * width) + (w + dx)) * 4
-                                    if 0 < i < tot:
-                                        pm_dilated[i : i + 3] = (0, 0, 0)
-                    else:
-                        if rgba[3] >= tolerance:
-                            for dx in range(-self.dilation, self.dilation):
-                                for dy in range(-self.dilation, self.dilation):
-                                    i = (((h + dy) * width) + (w + dx)) * 4
-                                    if 0 < i < tot:
-                                        pm_dilated[i + 3] = 1
-            pixels = tuple(pm_dilated)
-
-        # Apply alpha tolerance (trim outline)
-        if use_rgb:
-            for w in range(start, width_range):
-                for h in range(0, height):
-                    rgba = make_entry(h, width, w, pixels)
-                    if (
-                        rmin < rgba[0] < rmax
-                        and gmin < rgba[1] < gmax
-                        and bmin < rgba[2] < bmax
-                    ):
-                        pass
-                    else:
-                        pixel_map.append([w * scl, h * scl, rgba])
-        else:
-            for w in range(start, width_range):
-                for h in range(0, height):
-                    rgba = make_entry(h, width, w, pixels)
-                    if rgba[3] >= tolerance:
-                        pixel_map.append([w * scl, h * scl, rgba])
+            start, stop = screw_window(width, self.screw_flip)
+
+        rgb = self.rgb if use_rgb else None
+        tolerance = opacity_tolerance(self.opacity, use_rgb)
+
+        mask_key = stage_key(
+            key,
+            "mask",
+            start,
+            stop,
+            tolerance,
+            rgb if rgb is None else tuple(rgb),
+            self.dilation,
+        )
+        self.mask_key = mask_key
+        cached = stage_cache.get(mask_key)
+        if cached is None:
+            rgba = as_rgba(pixels, width, height)
+            cached = mask_pixels(rgba, tolerance, rgb, self.dilation, start, stop)
+            stage_cache.put(mask_key, cached)
+        pixel_xy, colors = cached
+
         # Limit colors
         if self.c2m:
-            pixel_map, self.cmats = reduce_colors(
-                pixelmap=pixel_map, threshold=self.c2threshold, cap=self.color_cap
-            )
+            threshold, cap = self.c2threshold, self.color_cap
         elif self.vcolor and self.vcthreshold > 0:
-            pixel_map, self.cmats = reduce_colors(
-                pixelmap=pixel_map, threshold=self.vcthreshold, cap=None
+            threshold, cap = self.vcthreshold, None
+        else:
+            palette_index = np.full(len(colors), -1, dtype=np.int32)
+            return pixel_xy, colors, palette_index
+
+        map_key = stage_key(mask_key, "map", threshold, cap)
+        cached = stage_cache.get(map_key)
+        if cached is None:
+            cached = reduce_colors(colors, threshold=threshold, cap=cap)
+            stage_cache.put(map_key, cached)
+        colors, self.cmats, palette_index = cached
+        return pixel_xy, colors, palette_index
+
+    def make_mesh_data(self, pixel_map, work_res, scl, name, axis="Front", key=None):
+        # key: The stage cache key of the pixel map mask
+        pixel_xy, colors, palette_index = pixel_map
+        mesh = bpy.data.meshes.new(name)
+        outline = self.reduce == "OUTLINE" and not (self.vcolor or self.c2m)
+        # (Tagged: Outline at tolerance 0.0 must not match the grid, False == 0.0)
+        fill = ("outline", self.outline_tolerance) if outline else ("grid",)
+        mesh_key = stage_key(key, "mesh", work_res, scl, axis, fill)
+        cached = stage_cache.get(mesh_key)
+        if cached is None:
+            cached = mesh_arrays(
+                pixel_xy,
+                work_res,
+                scl,
+                axis,
+                self.outline_tolerance if outline else None,
+                # (Blender's own, faster than the core's fallback)
+                tessellate=tessellate_polygon,
+            )
+            stage_cache.put(mesh_key, cached)
+        verts, loops, loop_starts = cached
+
+        if self.screw_flip:
+            loops = flip_faces(loops, loop_starts)
+        fill_mesh(mesh, verts, loops, loop_starts)
+
+        if self.vcolor:
+            # Pixel quads: 4 loops per face, all in the face (pixel) color
+            write_vertex_colors(mesh, np.repeat(colors, 4, axis=0))
+
+        if self.c2m:
+            # Palette index per face (pixel), ungrouped colors use the 1st slot
+            material_index = np.maximum(palette_index, 0)
+            mesh.polygons.foreach_set("material_index", material_index)
+
+        mesh.update()
+        return mesh
+
+    def make_component_mesh(
+        self, context, image, mesh_name, work_res, scl, axis_name, pixel_map=None
+    ):
+        # pixel_map: Already made (batch instancing), else made here
+        if self.tiled(work_res):
+            return self.make_tiled_mesh(
+                context, image, mesh_name, work_res, scl, axis_name
             )
 
+        if pixel_map is None:
+            pixel_map = self.component_pixel_map(context, image, work_res)
+
+        # Create Mesh Data
+        self.progress_update(context, " Create Mesh Data   ", False)
+        mesh = self.make_mesh_data(
+            pixel_map,
+            work_res,
+            scl,
+            name=mesh_name,
+            axis=axis_name,
+            key=self.mask_key,
+        )
+        self.progress_update(context, " Create Mesh Data   ", True)
+        self.profiler.count("faces_before_reduction", len(mesh.polygons))
+        self.profiler.count("verts_before_reduction", len(mesh.vertices))
+
+        # Bmesh Cleanup & Processing
+        self.progress_update(context, " Mesh Cleanup       ", False)
+        self.cleanup(mesh, scl, axis_name)
+        self.progress_update(context, " Mesh Cleanup       ", True)
+        return mesh
+
+    def tiled(self, work_res):
+        return not (self.vcolor or self.c2m) and 0 < self.tile_size < work_res
+
+    def mask_hash(self, pixel_xy, work_res, scl, axis_name):
+        """Batch instancing key: The thresholded mask & all the mesh settings"""
+        params = self.disk_cache_params(work_res, scl, axis_name)
+        h = hashlib.sha256(np.ascontiguousarray(pixel_xy, np.int64).tobytes())
+        h.update(json.dumps(params, sort_keys=True).encode())
+        return h.hexdigest()
+
+    @staticmethod
+    def read_work_pixels(image, work_res):
+        """The image scaled to work res, read into the shared pixel buffer"""
+        img = image.copy()
+        img.scale(width=work_res, height=work_res)
+        pixels = read_pixels(img)
+        # Remove temp work image
+        bpy.data.images.remove(img)
+        return pixels
+
+    def component_pixel_map(self, context, image, work_res):
+        # Redo panel stage cache key (not used by batches)
+        key = None if self.batch else image_key(image)
+        key = stage_key(key, work_res)
+
+        # Read Pixels (into shared float32 buffer)
+        self.progress_update(context, " Read Pixels        ", False)
+        pixels = stage_cache.get(stage_key(key, "pixels"))
+        if pixels is None:
+            pixels = self.read_work_pixels(image, work_res)
+            if key is not None:
+                pixels = pixels.copy()
+                stage_cache.put(stage_key(key, "pixels"), pixels)
+        width = work_res
+        height = work_res
+        self.progress_update(
+            context,
+            " Read Pixels        ",
+            True,
+            " %.1fMB" % (pixels.nbytes / 1048576),
+        )
+
+        # Make Pixel Map
+        self.progress_update(context, " Generate Pixel Map ", False)
+        pixel_map = self.make_pixel_map(
+            width, height, pixels, use_rgb=self.use_rgb, key=key
+        )
+        self.progress_update(context, " Generate Pixel Map ", True)
+        self.profiler.count("pixels", width * height)
+        self.profiler.count("mask_pixels", len(pixel_map[0]))
         return pixel_map
 
-    def make_mesh_data(self, pixel_map, work_res, scl, name, axis="Front"):
-        s = scl * 0.5
-        w = (work_res * scl) * 0.5
-        verts = []
-        faces = []
-        if axis == "Right":
-            for i, v in enumerate(pixel_map):
-                x, y = v[:2]
-                x -= w
-                verts.extend(
-                    [
-                        [0, -s + x, s + y],
-                        [0, -s + x, -s + y],
-                        [0, s + x, -s + y],
-                        [0, s + x, s + y],
-                    ]
-                )
-                offset = i * 4
-                faces.append([0 + offset, 1 + offset, 2 + offset, 3 + offset])
-        elif axis == "Top":
-            for i, v in enumerate(pixel_map):
-                x, y = v[:2]
-                x -= w
-                y -= w
-                verts.extend(
-                    [
-                        [-s + x, s + y, w],
-                        [-s + x, -s + y, w],
-                        [s + x, -s + y, w],
-                        [s + x, s + y, w],
-                    ]
-                )
-                offset = i * 4
-                faces.append([0 + offset, 1 + offset, 2 + offset, 3 + offset])
-        else:  # Front
-            for i, v in enumerate(pixel_map):
-                x, y = v[:2]
-                x -= w
-                verts.extend(
-                    [
-                        [-s + x, 0, s + y],
-                        [-s + x, 0, -s + y],
-                        [s + x, 0, -s + y],
-                        [s + x, 0, s + y],
-                    ]
-                )
-                offset = i * 4
-                faces.append([0 + offset, 1 + offset, 2 + offset, 3 + offset])
+    def make_hull_mesh(self, context, mesh_images, mesh_axis, mesh_name, work_res, scl):
+        # Boolean Geo, Voxel Hull: The component masks intersected directly
+        masks = {}
+        for image, axis_name in zip(mesh_images, mesh_axis):
+            if image is not None:
+                sys.stdout.write("%s Component:\n" % axis_name)
+                self.profiler.component = axis_name
+                pixel_xy = self.component_pixel_map(context, image, work_res)[0]
+                masks[axis_name] = pixel_mask(pixel_xy, work_res, work_res)
+
+        sys.stdout.write("Hull:\n")
+        self.profiler.component = "Hull"
+        self.progress_update(context, " Voxel Hull         ", False)
+        mesh = bpy.data.meshes.new(mesh_name)
+        verts, loops, loop_starts = hull_arrays(
+            masks.get("Front"),
+            masks.get("Right"),
+            masks.get("Top"),
+            scl,
+            work_res,
+            # (Coplanar runs as strips, straight verts dropped: Far fewer faces & verts
+            # for the dissolve below)
+            merge_flat=self.reduce != "NONE",
+        )
+        fill_mesh(mesh, verts, loops, loop_starts)
+        self.progress_update(context, " Voxel Hull         ", True)
+        self.profiler.count("faces_before_reduction", len(mesh.polygons))
+        self.profiler.count("verts_before_reduction", len(mesh.vertices))
+
+        # Flat sides to n-gons (as the Boolean Geo Simple reduction)
+        if self.reduce != "NONE":
+            self.progress_update(context, " Mesh Cleanup       ", False)
+            bm = bmesh.new()
+            bm.from_mesh(mesh)
+            bmesh.ops.dissolve_limit(
+                bm, angle_limit=0.08727, verts=bm.verts, edges=bm.edges
+            )
+            bm.to_mesh(mesh)
+            bm.free()
+            self.progress_update(context, " Mesh Cleanup       ", True)
+        return mesh
 
-        mesh = bpy.data.meshes.new(name)
-        mesh.from_pydata(verts, [], faces)
+    def component_mesh(
+        self, context, image, mesh_name, work_res, scl, axis_name, instancing=False
+    ):
+        # From the disk cache, or made (& stored there). Instancing: A mesh already
+        # made for the same mask is shared. Returns the mesh & its instancing key
+        disk_key = None
+        if self.disk_cache:
+            disk_key = diskcache.cache_key(
+                image, self.disk_cache_params(work_res, scl, axis_name)
+            )
+        arrays = diskcache.load(disk_key)
+
+        pixel_map = None
+        batch_key = None
+        if instancing:
+            if arrays is None:
+                pixel_map = self.component_pixel_map(context, image, work_res)
+                batch_key = self.mask_hash(pixel_map[0], work_res, scl, axis_name)
+            elif "mask_hash" in arrays:
+                # (Stored with the cached mesh: No pixel map needed)
+                batch_key = str(arrays["mask_hash"])
+            mesh = bpy.data.meshes.get(batch_meshes.get(batch_key, ""))
+            if mesh is not None:
+                self.profiler.count("instanced", True)
+                return mesh, batch_key
+
+        existing = bpy.data.meshes.get(mesh_name)
+        if existing:
+            bpy.data.meshes.remove(existing)
 
-        if self.screw_flip:
-            mesh.flip_normals()
+        if arrays is not None:
+            self.progress_update(context, " Load Cached Mesh   ", False)
+            mesh = self.mesh_from_cache(mesh_name, arrays)
+            self.progress_update(context, " Load Cached Mesh   ", True)
+            self.profiler.count("cached", True)
+        else:
+            mesh = self.make_component_mesh(
+                context, image, mesh_name, work_res, scl, axis_name, pixel_map
+            )
+            if disk_key is not None:
+                arrays = self.mesh_cache_arrays(mesh)
+                if batch_key is not None:
+                    arrays["mask_hash"] = np.array(batch_key)
+                diskcache.save(disk_key, arrays, self.disk_cache_size)
+
+        if batch_key is not None:
+            batch_meshes[batch_key] = mesh.name
+        return mesh, batch_key
+
+    def make_tiled_mesh(self, context, image, mesh_name, work_res, scl, axis_name):
+        # Read Pixels at work res (same scaling as untiled): The tiles are slices of it
+        self.progress_update(context, " Read Pixels        ", False)
+        work = as_rgba(self.read_work_pixels(image, work_res), work_res, work_res)
+        self.progress_update(
+            context,
+            " Read Pixels        ",
+            True,
+            " %.1fMB" % (work.nbytes / 1048576),
+        )
 
-        if self.vcolor or self.c2m:
-            vc = mesh.vertex_colors.new()
+        window = (0, work_res)
+        if self.geo == "SCREW":
+            window = screw_window(work_res, self.screw_flip)
+        rgb = self.rgb if self.use_rgb else None
+        tolerance = opacity_tolerance(self.opacity, self.use_rgb)
+        outline_tolerance = None
+        if self.reduce == "OUTLINE":
+            outline_tolerance = self.outline_tolerance
+
+        def tile_arrays(tile):
+            # (Worker threads: NumPy & mathutils only)
+            pixel_xy, _ = tile_pixels(
+                work, tile, tolerance, rgb, self.dilation, window
+            )
+            if not len(pixel_xy):
+                return None
+            return tile_mesh_arrays(
+                pixel_xy,
+                tile,
+                work_res,
+                scl,
+                axis_name,
+                outline_tolerance,
+                tessellate=tessellate_polygon,
+            )
 
-            for f, c in zip(mesh.polygons, pixel_map):
-                if self.vcolor:
-                    for loop in f.loop_indices:
-                        vc.data[loop].color = c[2]
-                if self.c2m:
-                    for i, color in enumerate(self.cmats):
-                        if c[2] == color:
-                            f.material_index = i
+        # Tile meshes: Generated on worker threads (a few tiles ahead, bounding
+        # memory), reduced (bmesh) one at a time here, with the seams pinned
+        tiles = tile_grid(work_res, self.tile_size)
+        threads = min(4, os.cpu_count() or 1)
+        self.progress_update(context, " Tiles              ", False)
+        parts = []
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            pending = deque()
+            for tile in tiles:
+                pending.append(executor.submit(tile_arrays, tile))
+                if len(pending) > threads:
+                    arrays = pending.popleft().result()
+                    parts.append(self.reduce_tile(arrays, scl, axis_name))
+            while pending:
+                arrays = pending.popleft().result()
+                parts.append(self.reduce_tile(arrays, scl, axis_name))
+        parts = [part for part in parts if part is not None]
+        self.progress_update(context, " Tiles              ", True, " %d" % len(tiles))
+        self.profiler.count("tiles", len(tiles))
+
+        self.progress_update(context, " Stitch Tiles       ", False)
+        mesh = bpy.data.meshes.new(mesh_name)
+        fill_mesh(mesh, *stitch_tiles(parts))
+        self.progress_update(context, " Stitch Tiles       ", True)
+        return mesh
 
+    def reduce_tile(self, arrays, scl, axis_name):
+        """Bmesh reduction of one tile's mesh arrays, with its seam verts pinned"""
+        if arrays is None:
+            return None
+        verts, loops, loop_starts, seam = arrays
+        if self.screw_flip:
+            loops = flip_faces(loops, loop_starts)
+        mesh = bpy.data.meshes.new("i2m_tile")
+        fill_mesh(mesh, verts, loops, loop_starts)
+        seam = self.cleanup(mesh, scl, axis_name, seam=seam)
+        verts, loops, loop_starts, _ = read_mesh_arrays(mesh)
+        bpy.data.meshes.remove(mesh)
+        return verts, loops, loop_starts, seam
+
+    def disk_cache_params(self, work_res, scl, axis_name):
+        # Everything the (cleaned up) component mesh depends on
+        params = {p: getattr(self, p) for p in DISK_CACHE_PARAMS}
+        params.update(
+            version=kei2m_version,
+            geo=self.geo,
+            c2m=self.c2m,
+            use_rgb=self.use_rgb,
+            rgb=tuple(self.rgb),
+            color_cap=self.color_cap,
+            work_res=work_res,
+            scl=scl,
+            axis=axis_name,
+        )
+        return params
+
+    def mesh_cache_arrays(self, mesh):
+        verts, loops, loop_starts, material_index = read_mesh_arrays(mesh)
+        arrays = {
+            "verts": verts,
+            "loops": loops,
+            "loop_starts": loop_starts,
+            "material_index": material_index,
+            "palette": np.array(self.cmats, dtype=np.float32).reshape(-1, 4),
+        }
+        loop_colors = read_vertex_colors(mesh) if self.vcolor else None
+        if loop_colors is not None:
+            arrays["loop_colors"] = loop_colors
+        return arrays
+
+    def mesh_from_cache(self, mesh_name, arrays):
+        mesh = bpy.data.meshes.new(mesh_name)
+        fill_mesh(mesh, arrays["verts"], arrays["loops"], arrays["loop_starts"])
+        mesh.polygons.foreach_set("material_index", arrays["material_index"])
+        if "loop_colors" in arrays:
+            write_vertex_colors(mesh, arrays["loop_colors"])
+        self.cmats = [tuple(c) for c in arrays["palette"].tolist()]
         mesh.update()
         return mesh
 
-    def cleanup(self, mesh, scl, axis="Front"):
+    def cleanup(self, mesh, scl, axis="Front", seam=None):
+        # seam: Tile seam flag per vert (tiled mode). Seam verts stay in place, to be
+        # welded to the next tiles. Returns the (remaining) verts' seam flags
         bm = bmesh.new()
         bm.from_mesh(mesh)
-        bmesh.ops.remove_doubles(bm, verts=bm.verts, dist=scl * 0.25)
+        pinned = set()
+        if seam is not None:
+            # (A new layer reallocates the verts: Before any BMVert is collected)
+            layer = bm.verts.layers.int.new("i2m_seam")
+            bm.verts.ensure_lookup_table()
+            for i in np.flatnonzero(seam).tolist():
+                bm.verts[i][layer] = 1
+                pinned.add(bm.verts[i])
         inner_verts = [v for v in bm.verts if not v.is_boundary]
 
         if self.reduce == "DISSOLVE":
@@ -544,7 +888,7 @@ class KeI2M(Operator):
                         }
                         if dup:
                             smoothverts.extend(dup)
-                smoothverts = list(set(smoothverts))
+                smoothverts = list(set(smoothverts) - pinned)
                 if smoothverts:
                     bmesh.ops.dissolve_verts(
                         bm,
@@ -554,13 +898,18 @@ class KeI2M(Operator):
                     )
                     bmesh.ops.unsubdivide(bm, verts=inner_verts, iterations=64)
                     bmesh.ops.dissolve_limit(
-                        bm, angle_limit=0.08727, verts=bm.verts, edges=bm.edges
+                        bm,
+                        angle_limit=0.08727,
+                        verts=self.unpinned(bm, pinned),
+                        edges=bm.edges,
                     )
 
         elif self.reduce == "SIMPLE":
             bmesh.ops.unsubdivide(bm, verts=inner_verts, iterations=64)
             if not self.geo == "BOOLEAN":
-                smoothverts = [v for v in bm.verts if v.is_boundary]
+                smoothverts = [
+                    v for v in bm.verts if v.is_boundary and v not in pinned
+                ]
                 bmesh.ops.smooth_vert(
                     bm,
                     verts=smoothverts,
@@ -571,7 +920,10 @@ class KeI2M(Operator):
                 )
             else:
                 bmesh.ops.dissolve_limit(
-                    bm, angle_limit=0.08727, verts=bm.verts, edges=bm.edges
+                    bm,
+                    angle_limit=0.08727,
+                    verts=self.unpinned(bm, pinned),
+                    edges=bm.edges,
                 )
 
         elif self.reduce == "REDUCED":
@@ -589,8 +941,18 @@ class KeI2M(Operator):
         elif axis == "Top":
             bmesh.ops.translate(bm, vec=Vector((c, c, 0)), space=mtx, verts=bm.verts)
 
+        if seam is not None:
+            seam = np.array([v[layer] for v in bm.verts], dtype=bool)
+            bm.verts.layers.int.remove(layer)
         bm.to_mesh(mesh)
         bm.free()
+        return seam
+
+    @staticmethod
+    def unpinned(bm, pinned):
+        if not pinned:
+            return bm.verts
+        return [v for v in bm.verts if v not in pinned]
 
     def make_scene_object(self, mesh, name):
         obj = bpy.data.objects.new(name, mesh)
@@ -607,66 +969,60 @@ class KeI2M(Operator):
         self.coll.objects.link(projector)
         projector.hide_viewport = True
         projector.empty_display_type = "SINGLE_ARROW"
-        if axis == "Right":
-            projector.rotation_euler = [-1.5707963, 3.1415926, -1.5707963]
-        elif axis == "Top":
-            projector.rotation_euler[2] = 1.5707963
-        elif axis == "Back":
-            projector.rotation_euler = [-1.5707963, 3.1415926, 0]
-        elif axis == "Left":
-            projector.rotation_euler = [1.5707963, 0, -1.5707963]
-        elif axis == "Bottom":
-            projector.rotation_euler = [-3.1415926, 0, 1.5707963]
-        else:  # Front
-            projector.rotation_euler[0] = 1.5707963
+        projector.rotation_euler = PROJECTOR_ROTATIONS.get(
+            axis, PROJECTOR_ROTATIONS["Front"]
+        )
         projector.location[2] = w
+        projector.scale = self.projector_scale(w)
+        return projector
+
+    def projector_scale(self, w):
         # Hack compensation
         if self.geo == "SCREW":
             val = (self.screw_xcomp / 1000) + w
-            projector.scale = (val, w, w)
+            return (val, w, w)
+        return (w, w, w)
+
+    def project_uvs(self, obj, w):
+        """The live UV projection (projector empties & UV Project modifier), written to
+        the UV map directly. Object space: The object transform cancels out of it"""
+        if self.front_only:
+            plist = ["Front"]
         else:
-            projector.scale = (w, w, w)
-        return projector
+            plist = ["Front", "Right", "Top", "Back", "Left", "Bottom"]
+        projectors = []
+        for i, axis_name in enumerate(plist):
+            if self.noz and not self.front_only and i in (2, 5):
+                continue
+            scale = self.projector_scale(w)
+            if not self.front_only:
+                if (i == 4 and self.flip_left) or (i == 3 and self.flip_back):
+                    scale = (-w, w, w)
+            projectors.append(
+                projector_matrix(PROJECTOR_ROTATIONS[axis_name], scale, (0, 0, w))
+            )
 
-    def make_material(self, name, img):
-        m = bpy.data.materials.get(name)
-        if m:
-            bpy.data.materials.remove(m)
-        m = bpy.data.materials.new(name=name)
-        m.use_nodes = True
-        shader = m.node_tree.nodes["Material Output"].inputs[0].links[0].from_node
-        # Color
-        n_color = m.node_tree.nodes.new("ShaderNodeTexImage")
-        m.node_tree.links.new(shader.inputs["Base Color"], n_color.outputs[0])
-        n_color.image = img
-        n_color.location = (-1100, 215)
-        # Quick-and-Dirty Colormap-Texturing
-        if self.qnd_mat:
-            n_rbgmix = m.node_tree.nodes.new("ShaderNodeMixRGB")
-            n_rbgmix.location = (-800, 100)
-            m.node_tree.links.new(n_color.outputs[0], n_rbgmix.inputs[1])
-
-            n_rbg2bw = m.node_tree.nodes.new("ShaderNodeRGBToBW")
-            n_rbg2bw.location = (-600, 100)
-            m.node_tree.links.new(n_rbgmix.outputs[0], n_rbg2bw.inputs[0])
-
-            n_invert = m.node_tree.nodes.new("ShaderNodeInvert")
-            n_invert.location = (-400, 25)
-            m.node_tree.links.new(n_rbg2bw.outputs[0], n_invert.inputs[1])
-
-            n_bump = m.node_tree.nodes.new("ShaderNodeBump")
-            n_bump.inputs[0].default_value = 0.05
-            n_bump.inputs[1].default_value = 0.05
-            n_bump.location = (-400, -265)
-            m.node_tree.links.new(n_rbg2bw.outputs[0], n_bump.inputs[2])
-            m.node_tree.links.new(shader.inputs["Normal"], n_bump.outputs[0])
-
-            n_mul = m.node_tree.nodes.new("ShaderNodeMath")
-            n_mul.operation = "MULTIPLY"
-            n_mul.location = (-200, 22)
-            m.node_tree.links.new(n_invert.outputs[0], n_mul.inputs[1])
-            m.node_tree.links.new(shader.inputs["Roughness"], n_mul.outputs[0])
-        return m
+        mesh = obj.data
+        verts, loops, loop_starts, _ = read_mesh_arrays(mesh)
+        normals = np.empty(len(mesh.polygons) * 3, dtype=np.float32)
+        mesh.polygons.foreach_get("normal", normals)
+        normals = normals.reshape(-1, 3)
+        uvs = project_uvs(verts, loops, loop_starts, normals, projectors)
+        uv_layer = mesh.uv_layers.get("UVmap") or mesh.uv_layers.new(name="UVmap")
+        uv_layer.data.foreach_set("uv", uvs.ravel())
+
+    def add_material(self, obj, mat):
+        if not self.object_materials:
+            obj.data.materials.append(mat)
+            return
+        # Shared (instanced) mesh: Object linked slots, the mesh only holds empty ones
+        index = self.material_count
+        self.material_count += 1
+        if len(obj.data.materials) <= index:
+            obj.data.materials.append(None)
+        slot = obj.material_slots[index]
+        slot.link = "OBJECT"
+        slot.material = mat
 
     def sort_material_slots(self, m_axis):
         # Project "through" if axis is missing (front+back etc)
@@ -713,25 +1069,33 @@ class KeI2M(Operator):
                     vecs.append(Vector((0, 0, -1)))
         return idx, vecs
 
-    def progress_update(self, context, txt, done):
+    def progress_update(self, context, txt, done, info=""):
+        # Console progress print out, timed by the profiler's stage spans
         if done:
-            tstat = round((time.time() - self.t), 5)
-            t = "{:f}".format(tstat).rstrip("0")
-            if len(t) > 6:
-                t = t[:6]
-            msg = "\r{0}: [   COMPLETE   ] {1}s\r\n".format(txt, t)
-            self.tot += float(t)
+            ns = self.profiler.end(txt.strip())
+            t = "{:f}".format(ns / 1e9).rstrip("0")[:6]
+            peak = process_peak_rss()
+            if peak is not None:
+                info += " (Process Peak RSS: %.1fMB)" % peak
+            msg = "\r{0}: [   COMPLETE   ] {1}s{2}\r\n".format(txt, t, info)
             self.wm.progress_update(99)
         else:
+            self.profiler.begin(txt.strip())
             msg = "\r{0}: [ Processing...]".format(txt)
             self.wm.progress_update(98)
         sys.stdout.write(msg)
         sys.stdout.flush()
-        self.t = time.time()
 
     def execute(self, context):
-        self.tot = 0
-
+        self.profiler = None
+        try:
+            return self.convert(context)
+        finally:
+            # (Also on errors: No cProfile / tracemalloc left running)
+            if self.profiler is not None:
+                self.profiler.stop_capture()
+
+    def convert(self, context):
         if self.reset:
             self.opacity = 95
             self.workres = "128"
@@ -745,15 +1109,22 @@ class KeI2M(Operator):
             self.apply = False
             self.apply_none = False
             self.angle = 0.5
+            self.bool_engine = "MODIFIER"
             self.reset = False
             self.custom_workres = 0
             self.vcolor = False
+            self.tile_size = 0
+            self.outline_tolerance = 1
+            self.live_uv = False
             return {"FINISHED"}
 
         k_props = context.scene.kei2m
         kap = context.preferences.addons["ke_i2m"].preferences
 
         self.color_cap = kap.cap
+        stage_cache.set_budget(kap.cache_budget * 1048576)
+        self.disk_cache = kap.disk_cache
+        self.disk_cache_size = kap.disk_cache_size * 1048576
 
         self.use_rgb = kap.use_rgb
         if self.use_rgb:
@@ -778,7 +1149,7 @@ class KeI2M(Operator):
             sys.stdout.write(" - Using RGB instead of Alpha -\n")
         self.wm = context.window_manager
         self.wm.progress_begin(0, 99)
-        self.t = time.time()
+        self.profiler = Profiler(kap.profile_capture)
 
         # Get current collection
         cvl = context.view_layer.active_layer_collection.name
@@ -804,6 +1175,10 @@ class KeI2M(Operator):
             self.angle = k_props.angle
             self.vcolor = k_props.vcolor
             self.custom_workres = k_props.custom_workres
+            self.tile_size = k_props.tile_size
+            self.outline_tolerance = k_props.outline_tolerance
+            self.bool_engine = k_props.bool_engine
+            self.live_uv = k_props.live_uv
 
         # Auto Set View mode QoL (and make sure no geo smoothing is used for vertex color mode)
         if context.space_data:
@@ -983,48 +1358,64 @@ class KeI2M(Operator):
             axis = ["Front"]
 
         objects = []
+        self.object_materials = False
+        voxel_hull = (
+            self.geo == "BOOLEAN" and self.bool_engine == "VOXEL" and not self.vcolor
+        )
+        # Batch instancing: Identical masks share one mesh (linked data). Not when
+        # modifiers get baked into it (the next image would get the baked mesh)
+        bakes = self.apply or (
+            self.geo == "BOOLEAN" and not voxel_hull and not self.apply_none
+        )
+        instancing = (
+            self.batch
+            and not bakes
+            and not (self.vcolor or self.c2m)
+            and not self.tiled(work_res)
+        )
 
-        for image, axis_name in zip(mesh_images, mesh_axis):
-            if image is not None:
-                sys.stdout.write("%s Component:\n" % axis_name)
-                img = image.copy()
-                img.scale(width=work_res, height=work_res)
-
-                # Make Pixel Map
-                self.progress_update(context, " Generate Pixel Map ", False)
-                pixels = img.pixels[:]
-                width = img.size[0]
-                height = img.size[1]
-                pixel_map = self.make_pixel_map(
-                    width, height, pixels, scl, use_rgb=self.use_rgb
-                )
-                self.progress_update(context, " Generate Pixel Map ", True)
-
-                # Create Mesh Data
-                self.progress_update(context, " Create Mesh Data   ", False)
-                mesh_name = name + "_i2m_" + axis_name
-                existing = bpy.data.meshes.get(mesh_name)
-                if existing:
-                    bpy.data.meshes.remove(existing)
-                mesh = self.make_mesh_data(
-                    pixel_map, work_res, scl, name=mesh_name, axis=axis_name
-                )
-                self.progress_update(context, " Create Mesh Data   ", True)
-
-                # Bmesh Cleanup & Processing
-                self.progress_update(context, " Mesh Cleanup       ", False)
-                self.cleanup(mesh, scl, axis_name)
+        if voxel_hull:
+            first = [a for i, a in zip(mesh_images, mesh_axis) if i is not None][0]
+            mesh_name = name + "_i2m_" + first
+            existing = bpy.data.meshes.get(mesh_name)
+            if existing:
+                bpy.data.meshes.remove(existing)
+            mesh = self.make_hull_mesh(
+                context, mesh_images, mesh_axis, mesh_name, work_res, scl
+            )
+            self.profiler.count("faces", len(mesh.polygons))
+            self.profiler.count("verts", len(mesh.vertices))
+            obj = self.make_scene_object(mesh, name=mesh_name)
+            obj.data.uv_layers.new(name="UVmap")
+            objects.append(obj)
+        else:
+            for image, axis_name in zip(mesh_images, mesh_axis):
+                if image is not None:
+                    sys.stdout.write("%s Component:\n" % axis_name)
+                    self.profiler.component = axis_name
+                    mesh_name = name + "_i2m_" + axis_name
+
+                    mesh, batch_key = self.component_mesh(
+                        context,
+                        image,
+                        mesh_name,
+                        work_res,
+                        scl,
+                        axis_name,
+                        instancing,
+                    )
+                    self.object_materials = batch_key is not None
 
-                # Create New Object from Mesh Data
-                obj = self.make_scene_object(mesh, name=mesh_name)
-                obj.data.uv_layers.new(name="UVmap")
-                objects.append(obj)
-                if axis_name == "Top":
-                    obj.rotation_euler[2] = 1.5707963
+                    self.profiler.count("faces", len(mesh.polygons))
+                    self.profiler.count("verts", len(mesh.vertices))
 
-                self.progress_update(context, " Mesh Cleanup       ", True)
-                # Remove temp work image
-                bpy.data.images.remove(img)
+                    # Create New Object from Mesh Data
+                    obj = self.make_scene_object(mesh, name=mesh_name)
+                    if "UVmap" not in obj.data.uv_layers:
+                        obj.data.uv_layers.new(name="UVmap")
+                    objects.append(obj)
+                    if axis_name == "Top":
+                        obj.rotation_euler[2] = 1.5707963
 
         final_object = objects.pop(0)
 
@@ -1033,36 +1424,42 @@ class KeI2M(Operator):
         # ----------------------------------------------------------------------------------------------
         # # Make UV Projectors & Materials
         # ----------------------------------------------------------------------------------------------
+        # Live UV projection: Opt-in, or needed on top of modifiers left live
+        modifiers = self.geo == "SCREW" or (
+            self.geo == "BOOLEAN" and not voxel_hull and self.apply_none
+        )
+        live_uv = self.live_uv or (modifiers and not self.apply)
+        projectors = []
+
         if self.c2m:
-            for i, material in enumerate(self.cmats):
-                mat = bpy.data.materials.new(name="I2M_" + str(i))
-                mat.diffuse_color = material
-                final_object.data.materials.append(mat)
+            for material in self.cmats:
+                final_object.data.materials.append(color_material(material))
 
         elif not self.vcolor:
             self.progress_update(context, " UV & Shading       ", False)
 
-            projectors = []
             # Make UV Projectors
             if self.front_only:
                 plist = ["Front"]
             else:
                 plist = ["Front", "Right", "Top", "Back", "Left", "Bottom"]
 
-            for axis_name in plist:
-                pname = final_object.name + axis_name + "_UVProjector"
-                projector = self.make_projector(pname, w, axis_name)
-                projector.parent = final_object
-                projectors.append(projector)
+            if live_uv:
+                for axis_name in plist:
+                    pname = final_object.name + axis_name + "_UVProjector"
+                    projector = self.make_projector(pname, w, axis_name)
+                    projector.parent = final_object
+                    projectors.append(projector)
 
             mat_axis = []
+            self.material_count = 0
             # Make Materials
             for img, axis_name in zip(images, axis):
                 if img is not None:
                     # Adding Materials
                     material_name = img.name.split(".")[0] + "_Material"
-                    mat = self.make_material(material_name, img)
-                    final_object.data.materials.append(mat)
+                    mat = image_material(material_name, img, self.qnd_mat)
+                    self.add_material(final_object, mat)
                     mat_axis.append(axis_name)
 
             if "Top" not in mat_axis and "Bottom" not in mat_axis:
@@ -1070,7 +1467,7 @@ class KeI2M(Operator):
             else:
                 self.noz = False
 
-        self.progress_update(context, " UV & Shading       ", True)
+            self.progress_update(context, " UV & Shading       ", True)
 
         # ----------------------------------------------------------------------------------------------
         # Modfiers & Finalize
@@ -1082,39 +1479,38 @@ class KeI2M(Operator):
             screw.use_merge_vertices = True
 
         elif self.geo == "BOOLEAN":
-            solidify_objects = [final_object] + objects
-            for obj in solidify_objects:
-                context.view_layer.objects.active = obj
-                solidify = obj.modifiers.new(name="I2M Solidify", type="SOLIDIFY")
-                solidify.thickness = self.width
-                solidify.offset = 0.0
-                solidify.use_quality_normals = False
+            if not voxel_hull:
+                solidify_objects = [final_object] + objects
+                for obj in solidify_objects:
+                    solidify = obj.modifiers.new(name="I2M Solidify", type="SOLIDIFY")
+                    solidify.thickness = self.width
+                    solidify.offset = 0.0
+                    solidify.use_quality_normals = False
+
+                final_object.select_set(True)
+                context.view_layer.objects.active = final_object
+                # BOOLEAN OPS (the cutters are evaluated with their Solidify)
+                for obj in objects:
+                    boolean = final_object.modifiers.new(name="I2MBool", type="BOOLEAN")
+                    boolean.operation = "INTERSECT"
+                    boolean.use_hole_tolerant = True
+                    boolean.object = obj
                 if not self.apply_none:
-                    bpy.ops.object.modifier_apply(modifier="I2M Solidify")
-
-            final_object.select_set(True)
-            context.view_layer.objects.active = final_object
-            # BOOLEAN OPS
-            for obj in objects:
-                boolean = final_object.modifiers.new(name="I2MBool", type="BOOLEAN")
-                boolean.operation = "INTERSECT"
-                boolean.use_hole_tolerant = True
-                boolean.object = obj
-                if not self.apply_none:
-                    bpy.ops.object.modifier_apply(modifier="I2MBool")
-                    bpy.data.objects.remove(obj)
+                    # Solidify & Bools baked in one evaluation
+                    apply_modifiers(context, final_object)
+                    for obj in objects:
+                        bpy.data.objects.remove(obj)
 
             # Assing materials to faces
             if not self.vcolor:
                 idx, vecs = self.sort_material_slots(mat_axis)
-
-                for p in final_object.data.polygons:
-                    n = p.normal
-                    p.material_index = 0
-                    for i, v in zip(idx, vecs):
-                        if -self.angle > n.dot(v) < self.angle:
-                            p.material_index = i
-                            break
+                polygons = final_object.data.polygons
+                normals = np.empty(len(polygons) * 3, dtype=np.float32)
+                polygons.foreach_get("normal", normals)
+                material_index = axis_material_index(
+                    normals.reshape(-1, 3), idx, vecs, self.angle
+                )
+                polygons.foreach_set("material_index", material_index)
 
         if self.shade_smooth:
             values = [True] * len(final_object.data.polygons)
@@ -1123,6 +1519,11 @@ class KeI2M(Operator):
         # Lastly, setup UV projection
         if self.vcolor or self.c2m:
             pass
+        elif not live_uv:
+            if self.apply:
+                # (Screw) The UVs go on the final geometry
+                apply_modifiers(context, final_object)
+            self.project_uvs(final_object, w)
         else:
             uv_project = final_object.modifiers.new(
                 name="I2M UV-Project", type="UV_PROJECT"
@@ -1145,8 +1546,8 @@ class KeI2M(Operator):
         context.view_layer.objects.active = final_object
 
         if self.apply:
-            for m in final_object.modifiers:
-                bpy.ops.object.modifier_apply(modifier=m.name)
+            # Screw & UV Project: One evaluation
+            apply_modifiers(context, final_object)
             for p in projectors:
                 bpy.data.objects.remove(p)
 
@@ -1158,10 +1559,28 @@ class KeI2M(Operator):
 
         self.wm.progress_end()
 
-        if self.tot > 60:
-            tot = str(round((self.tot / 60), 1)) + "min"
+        self.profiler.component = ""
+        self.profiler.count("faces", len(final_object.data.polygons))
+        self.profiler.count("verts", len(final_object.data.vertices))
+        report = self.profiler.report(
+            image=count_images[0].name,
+            filepath=bpy.path.abspath(count_images[0].filepath),
+            geo=k_props.geo,
+            reduce=self.reduce,
+            work_res=work_res,
+            images=self.img_count,
+        )
+        reports.append(report)
+        if kap.profile_log:
+            write_report(
+                report, bpy.path.abspath(kap.profile_log), kap.profile_format
+            )
+
+        total = report["total_ns"] / 1e9
+        if total > 60:
+            tot = str(round((total / 60), 1)) + "min"
         else:
-            tot = "{:f}".format(self.tot).rstrip("0") + "s"
+            tot = "{:f}".format(total).rstrip("0") + "s"
 
         sys.stdout.write("\n Total              : [   COMPLETE   ] %s\n\n" % tot)
         sys.stdout.flush()
@@ -1181,9 +1600,14 @@ class KeI2M(Operator):
             k_props.angle = self.angle
             k_props.custom_workres = self.custom_workres
             k_props.vcolor = self.vcolor
+            k_props.tile_size = self.tile_size
+            k_props.outline_tolerance = self.outline_tolerance
+            k_props.bool_engine = self.bool_engine
+            k_props.live_uv = self.live_uv
 
         # Needed for 1st-runs, or images can't be accessed by redo panel?!
-        bpy.ops.ed.undo_push()
+        if not bpy.app.background:
+            bpy.ops.ed.undo_push()
         if context.area:
             context.area.tag_redraw()
 
@@ -0,0 +1,107 @@
+import bpy
+
+from .utilities import is_bversion
+
+# Template node group: The QnD Roughness & Bump chain, shared by all i2m materials
+QND_GROUP = "I2M QnD Shading"
+IMAGE_NODE = "I2M Image"
+
+
+def qnd_group():
+    """The shared Quick-n-Dirty shading node group (made once per .blend):
+    Color in, Roughness & Normal (Bump) out"""
+    group = bpy.data.node_groups.get(QND_GROUP)
+    if group is not None:
+        return group
+    group = bpy.data.node_groups.new(QND_GROUP, "ShaderNodeTree")
+    sockets = (
+        ("Color", "INPUT", "NodeSocketColor"),
+        ("Roughness", "OUTPUT", "NodeSocketFloat"),
+        ("Normal", "OUTPUT", "NodeSocketVector"),
+    )
+    for name, in_out, socket_type in sockets:
+        if is_bversion(4000):
+            group.interface.new_socket(name, in_out=in_out, socket_type=socket_type)
+        elif in_out == "INPUT":
+            group.inputs.new(socket_type, name)
+        else:
+            group.outputs.new(socket_type, name)
+
+    nodes, links = group.nodes, group.links
+    n_input = nodes.new("NodeGroupInput")
+    n_input.location = (-1000, 100)
+    n_output = nodes.new("NodeGroupOutput")
+    n_output.location = (0, 0)
+
+    n_rbgmix = nodes.new("ShaderNodeMixRGB")
+    n_rbgmix.location = (-800, 100)
+    links.new(n_input.outputs["Color"], n_rbgmix.inputs[1])
+
+    n_rbg2bw = nodes.new("ShaderNodeRGBToBW")
+    n_rbg2bw.location = (-600, 100)
+    links.new(n_rbgmix.outputs[0], n_rbg2bw.inputs[0])
+
+    n_invert = nodes.new("ShaderNodeInvert")
+    n_invert.location = (-400, 25)
+    links.new(n_rbg2bw.outputs[0], n_invert.inputs[1])
+
+    n_bump = nodes.new("ShaderNodeBump")
+    n_bump.inputs["Strength"].default_value = 0.05
+    n_bump.inputs["Distance"].default_value = 0.05
+    n_bump.location = (-400, -265)
+    links.new(n_rbg2bw.outputs[0], n_bump.inputs["Height"])
+    links.new(n_bump.outputs[0], n_output.inputs["Normal"])
+
+    n_mul = nodes.new("ShaderNodeMath")
+    n_mul.operation = "MULTIPLY"
+    n_mul.location = (-200, 22)
+    links.new(n_invert.outputs[0], n_mul.inputs[1])
+    links.new(n_mul.outputs[0], n_output.inputs["Roughness"])
+    return group
+
+
+def image_material(name, img, qnd=False):
+    """Image texture material, reused when one by this name already shows the image
+    (with the same QnD setting). QnD: The shared template group drives Roughness/Bump"""
+    m = bpy.data.materials.get(name)
+    if m is not None:
+        tex = m.node_tree.nodes.get(IMAGE_NODE) if m.node_tree else None
+        if tex is not None and tex.image == img and bool(m.get("i2m_qnd")) == qnd:
+            return m
+        if not m.users:
+            bpy.data.materials.remove(m)
+    m = bpy.data.materials.new(name=name)
+    m.use_nodes = True
+    m["i2m_qnd"] = qnd
+    shader = m.node_tree.nodes["Material Output"].inputs[0].links[0].from_node
+    # Color
+    n_color = m.node_tree.nodes.new("ShaderNodeTexImage")
+    n_color.name = IMAGE_NODE
+    m.node_tree.links.new(shader.inputs["Base Color"], n_color.outputs[0])
+    n_color.image = img
+    n_color.location = (-1100, 215)
+    # Quick-and-Dirty Colormap-Texturing
+    if qnd:
+        n_qnd = m.node_tree.nodes.new("ShaderNodeGroup")
+        n_qnd.node_tree = qnd_group()
+        n_qnd.location = (-400, 0)
+        m.node_tree.links.new(n_color.outputs[0], n_qnd.inputs["Color"])
+        m.node_tree.links.new(shader.inputs["Roughness"], n_qnd.outputs["Roughness"])
+        m.node_tree.links.new(shader.inputs["Normal"], n_qnd.outputs["Normal"])
+    return m
+
+
+def color_key(color):
+    """8-bit RGBA key of a color (palette colors closer than that share a material)"""
+    return tuple(min(max(int(round(c * 255)), 0), 255) for c in color)
+
+
+def color_material(color):
+    """Flat color (C2M palette) material, one per quantised color across runs"""
+    key = color_key(color)
+    name = "I2M_" + "".join("%02X" % c for c in key)
+    m = bpy.data.materials.get(name)
+    if m is None:
+        m = bpy.data.materials.new(name=name)
+        m.diffuse_color = [c / 255 for c in key]
+    return m
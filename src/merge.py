@@ -0,0 +1,141 @@
+import sys
+import bpy
+import numpy as np
+
+from .core import chunk_parts, layout_offsets, merge_arrays
+from .utilities import (
+    apply_modifiers,
+    fill_mesh,
+    read_mesh_arrays,
+    read_vertex_colors,
+    write_vertex_colors,
+)
+
+# Face attribute: Index of the source (image) object in the merged object's
+# "i2m_sources" list
+SOURCE_ATTRIBUTE = "i2m_source"
+
+
+def object_arrays(context, obj):
+    """An object's (baked) mesh arrays in its parent space, with the per-loop UVs &
+    colors, per-face smooth flags & its materials"""
+    if obj.modifiers:
+        apply_modifiers(context, obj)
+    mesh = obj.data
+    verts, loops, loop_starts, material_index = read_mesh_arrays(mesh)
+    matrix = np.array(obj.matrix_basis, dtype=np.float32)
+    verts = verts @ matrix[:3, :3].T + matrix[:3, 3]
+    uv_layer = mesh.uv_layers.get("UVmap") or mesh.uv_layers.active
+    uvs = None
+    if uv_layer is not None:
+        uvs = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+        uv_layer.data.foreach_get("uv", uvs)
+        uvs = uvs.reshape(-1, 2)
+    smooth = np.empty(len(mesh.polygons), dtype=bool)
+    mesh.polygons.foreach_get("use_smooth", smooth)
+    return {
+        "name": obj.name,
+        "arrays": (verts, loops, loop_starts),
+        "material_index": material_index,
+        # (The slots' materials: Object linked ones too, as on instanced meshes)
+        "materials": [slot.material for slot in obj.material_slots],
+        "uvs": uvs,
+        "colors": read_vertex_colors(mesh),
+        "smooth": smooth,
+    }
+
+
+def merged_mesh(name, parts, offsets, first):
+    """One mesh from the parts (placed at their offsets): Shared material slots, UVs,
+    colors & smooth flags carried over, the source index (from first) per face"""
+    verts, loops, loop_starts, source = merge_arrays(
+        [
+            (p["arrays"][0] + offset, p["arrays"][1], p["arrays"][2])
+            for p, offset in zip(parts, offsets)
+        ]
+    )
+    mesh = bpy.data.meshes.new(name)
+    fill_mesh(mesh, verts, loops, loop_starts)
+
+    # Material slots: Each material once, the face indices remapped to them
+    materials = []
+    material_index = []
+    for p in parts:
+        slots = []
+        for m in p["materials"] or [None]:
+            if m not in materials:
+                materials.append(m)
+            slots.append(materials.index(m))
+        slots = np.array(slots, dtype=np.int32)
+        material_index.append(slots[np.minimum(p["material_index"], len(slots) - 1)])
+    for m in materials:
+        mesh.materials.append(m)
+    mesh.polygons.foreach_set("material_index", np.concatenate(material_index))
+    smooth = np.concatenate([p["smooth"] for p in parts])
+    mesh.polygons.foreach_set("use_smooth", smooth)
+
+    loop_counts = [len(p["arrays"][1]) for p in parts]
+    if any(p["uvs"] is not None for p in parts):
+        uvs = [
+            p["uvs"] if p["uvs"] is not None else np.zeros((n, 2), dtype=np.float32)
+            for p, n in zip(parts, loop_counts)
+        ]
+        uv_layer = mesh.uv_layers.new(name="UVmap")
+        uv_layer.data.foreach_set("uv", np.concatenate(uvs).ravel())
+    if any(p["colors"] is not None for p in parts):
+        colors = [
+            p["colors"] if p["colors"] is not None else np.ones((n, 4), np.float32)
+            for p, n in zip(parts, loop_counts)
+        ]
+        write_vertex_colors(mesh, np.concatenate(colors))
+
+    if hasattr(mesh, "attributes"):
+        attribute = mesh.attributes.new(SOURCE_ATTRIBUTE, "INT", "FACE")
+        attribute.data.foreach_set("value", source + first)
+    mesh.update()
+    return mesh
+
+
+def merge_objects(context, objects, name, collection, layout="GRID", max_faces=0):
+    """Batch post-stage: Replace the (mesh) objects by one merged object, or a few
+    (chunks of at most max_faces faces), with the sources laid out in a grid or a row.
+    Each face keeps the index of its source in the i2m_source face attribute"""
+    sources = [o for o in objects if o.type == "MESH"]
+    if not sources:
+        return []
+    parts = [object_arrays(context, obj) for obj in sources]
+
+    # Grid cell: The largest source, plus a gap
+    sizes = [np.ptp(p["arrays"][0], axis=0).max() for p in parts if len(p["arrays"][0])]
+    extent = float(max(sizes, default=1.0))
+    offsets = layout_offsets(len(parts), extent * 1.25, layout)
+
+    names = [p["name"] for p in parts]
+    merged = []
+    chunks = chunk_parts([len(p["arrays"][2]) for p in parts], max_faces)
+    for n, chunk in enumerate(chunks):
+        chunk_name = name if len(chunks) == 1 else "%s_%d" % (name, n)
+        mesh = merged_mesh(
+            chunk_name, [parts[i] for i in chunk], offsets[chunk], chunk[0]
+        )
+        obj = bpy.data.objects.new(chunk_name, mesh)
+        obj["i2m_sources"] = names
+        collection.objects.link(obj)
+        merged.append(obj)
+
+    # Remove the sources (& their UV projector empties)
+    meshes = {obj.data for obj in sources}
+    for obj in sources:
+        for child in list(obj.children):
+            if child.type == "EMPTY" and child.name.endswith("_UVProjector"):
+                bpy.data.objects.remove(child)
+        bpy.data.objects.remove(obj)
+    for mesh in meshes:
+        if not mesh.users:
+            bpy.data.meshes.remove(mesh)
+
+    sys.stdout.write(
+        "kei2m Merge: %s objects merged into %s mesh(es)\n"
+        % (str(len(sources)), str(len(merged)))
+    )
+    return merged
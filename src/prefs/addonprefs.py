@@ -5,6 +5,7 @@ from bpy.props import (
     StringProperty,
     IntProperty,
     FloatVectorProperty,
+    EnumProperty,
 )
 
 from ..ui import VIEW3D_PT_i2m
@@ -52,6 +53,102 @@ class KeI2Maddonprefs(AddonPreferences):
         name="Material Cap",
         description="Maximum number of materials generated in Color 2 Material Mode.",
     )
+    cache_budget: IntProperty(
+        default=512,
+        min=0,
+        name="Redo Cache (MB)",
+        description="Memory budget for cached conversion stages (work pixels, pixel map &\n"
+        "mesh data), so redo panel tweaks only redo the stages they affect. 0 = Off",
+    )
+    disk_cache: BoolProperty(
+        default=False,
+        name="Disk Cache",
+        description="Store converted meshes on disk, keyed by image file contents & settings,\n"
+        "so converting the same image with the same settings again (in any session)\n"
+        "loads the mesh instead of regenerating it",
+    )
+    disk_cache_size: IntProperty(
+        default=1024,
+        min=1,
+        name="Disk Cache Size (MB)",
+        description="Maximum size of the disk cache, least recently used meshes are removed first",
+    )
+    profile_log: StringProperty(
+        default="",
+        subtype="FILE_PATH",
+        name="Profile Log",
+        description="Append a report of each conversion (stage timings, pixel/face/vert\n"
+        "counts & process peak RSS) to this file. Empty = Off",
+    )
+    profile_format: EnumProperty(
+        items=[
+            ("JSON", "JSON", "One JSON object (line) per conversion", "", 1),
+            ("CSV", "CSV", "One row per stage timing & count", "", 2),
+        ],
+        default="JSON",
+        name="Profile Log Format",
+    )
+    profile_capture: EnumProperty(
+        items=[
+            ("NONE", "None", "No capture", "", 1),
+            ("CPROFILE", "cProfile", "Python function profile (top functions)", "", 2),
+            ("TRACEMALLOC", "tracemalloc", "Python memory allocations (top lines)", "", 3),
+        ],
+        default="NONE",
+        name="Profile Capture",
+        description="Capture a Python profile in the report (slows the conversion down)",
+    )
+    batch_workers: IntProperty(
+        default=1,
+        min=1,
+        max=64,
+        name="Batch Workers",
+        description="Number of background Blender processes used by Batch Process Folder.\n"
+        "1 = Process the images one by one in this Blender session",
+    )
+    batch_atlas: BoolProperty(
+        default=False,
+        name="Batch Atlas",
+        description="Batch Process Folder: Pack all the images into shared atlas textures,\n"
+        "with the objects' UVs remapped into them & one material per atlas",
+    )
+    atlas_size: IntProperty(
+        default=4096,
+        min=64,
+        max=16384,
+        name="Atlas Size",
+        description="Max. atlas width & height (pixels). More atlases are made as needed",
+    )
+    batch_merge: BoolProperty(
+        default=False,
+        name="Batch Merge",
+        description="Batch Process Folder: Merge all the results into one mesh object\n"
+        "(or a few, see Max Faces), laid out in a grid or a row. The source of each\n"
+        "face is kept in the 'i2m_source' face attribute",
+    )
+    merge_layout: EnumProperty(
+        items=[
+            ("GRID", "Grid", "", "", 1),
+            ("ROW", "Row", "", "", 2),
+        ],
+        default="GRID",
+        name="Merge Layout",
+        description="Placement of the merged batch results",
+    )
+    merge_max_faces: IntProperty(
+        default=0,
+        min=0,
+        name="Max Faces",
+        description="Max. faces per merged mesh (split into more meshes above this)\n"
+        "0 = Everything in one mesh",
+    )
+    atlas_padding: IntProperty(
+        default=4,
+        min=0,
+        max=64,
+        name="Padding",
+        description="Pixels around each image in the atlas (edge pixels repeated)",
+    )
 
     def draw(self, context):
         layout = self.layout
@@ -64,3 +161,27 @@ class KeI2Maddonprefs(AddonPreferences):
         row = layout.row()
         row.use_property_split = True
         row.prop(self, "cap")
+        row = layout.row()
+        row.use_property_split = True
+        row.prop(self, "batch_workers")
+        row = layout.row(align=True)
+        row.prop(self, "batch_atlas", toggle=True)
+        row.prop(self, "atlas_size")
+        row.prop(self, "atlas_padding")
+        row = layout.row(align=True)
+        row.prop(self, "batch_merge", toggle=True)
+        row.prop(self, "merge_layout", expand=True)
+        row.prop(self, "merge_max_faces")
+        row = layout.row()
+        row.use_property_split = True
+        row.prop(self, "cache_budget")
+        row = layout.row(align=True)
+        row.prop(self, "disk_cache", toggle=True)
+        row.prop(self, "disk_cache_size")
+        row.operator("ke.i2m_clearcache", text="Clear Disk Cache")
+        row = layout.row()
+        row.use_property_split = True
+        row.prop(self, "profile_log")
+        row = layout.row(align=True)
+        row.prop(self, "profile_format", expand=True)
+        row.prop(self, "profile_capture", text="")
@@ -75,3 +75,7 @@ class KeI2Mprops(PropertyGroup):
     angle: FloatProperty(default=0.5)
     custom_workres: IntProperty(default=0)
     vcolor: BoolProperty(default=False)
+    tile_size: IntProperty(default=0)
+    outline_tolerance: FloatProperty(default=1.0)
+    bool_engine: StringProperty(default="MODIFIER")
+    live_uv: BoolProperty(default=False)
@@ -0,0 +1,134 @@
+import cProfile
+import csv
+import io
+import json
+import os
+import pstats
+import time
+import tracemalloc
+from collections import deque
+
+from .utilities import process_peak_rss
+
+# Reports of the latest runs (read by the command line & benchmark)
+reports = deque(maxlen=64)
+
+
+class Profiler:
+    """Instrumentation for one conversion run: Named stage spans (perf_counter_ns),
+    per component counters & an optional cProfile / tracemalloc capture"""
+
+    def __init__(self, capture="NONE"):
+        self.capture = capture
+        self.component = ""
+        self.spans = []
+        self.counters = {}
+        self.open = {}
+        self.profile = None
+        self.start_ns = time.perf_counter_ns()
+        if capture == "CPROFILE":
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+        elif capture == "TRACEMALLOC":
+            tracemalloc.start()
+
+    def begin(self, name):
+        self.open[name] = time.perf_counter_ns()
+
+    def end(self, name):
+        """Close the named span, returns its duration (ns)"""
+        ns = time.perf_counter_ns() - self.open.pop(name)
+        self.spans.append(
+            {
+                "component": self.component,
+                "stage": name,
+                "ns": ns,
+                "process_peak_rss_mb": process_peak_rss(),
+            }
+        )
+        return ns
+
+    def count(self, name, value):
+        self.counters.setdefault(self.component or "Object", {})[name] = value
+
+    @property
+    def total_ns(self):
+        return sum(span["ns"] for span in self.spans)
+
+    def stop_capture(self):
+        """Capture results (JSON-able), None without capture"""
+        if self.profile is not None:
+            self.profile.disable()
+            stats = pstats.Stats(self.profile, stream=io.StringIO())
+            stats.sort_stats("cumulative")
+            top = []
+            for func in stats.fcn_list[:25]:
+                _, calls, tottime, cumtime, _ = stats.stats[func]
+                top.append(
+                    {
+                        "function": "%s:%d(%s)" % func,
+                        "calls": calls,
+                        "tottime": tottime,
+                        "cumtime": cumtime,
+                    }
+                )
+            self.profile = None
+            return {"cprofile": top}
+        if self.capture == "TRACEMALLOC" and tracemalloc.is_tracing():
+            _, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            top = [
+                {"line": str(stat.traceback), "size_mb": stat.size / 1048576}
+                for stat in snapshot.statistics("lineno")[:25]
+            ]
+            return {"tracemalloc": {"peak_mb": peak / 1048576, "top": top}}
+        return None
+
+    def report(self, **info):
+        """The run report: info, spans, counters, process peak RSS & capture results"""
+        report = dict(info)
+        report.update(
+            time=time.strftime("%Y-%m-%dT%H:%M:%S"),
+            wall_ns=time.perf_counter_ns() - self.start_ns,
+            total_ns=self.total_ns,
+            spans=self.spans,
+            counters=self.counters,
+            process_peak_rss_mb=process_peak_rss(),
+        )
+        capture = self.stop_capture()
+        if capture:
+            report.update(capture)
+        return report
+
+
+def stage_seconds(report):
+    """Seconds per stage name (summed over the components) of a report"""
+    stages = {}
+    for span in report["spans"]:
+        stages[span["stage"]] = stages.get(span["stage"], 0) + span["ns"] / 1e9
+    return stages
+
+
+def write_report(report, path, file_format="JSON"):
+    """Append a run report to a log file: As a JSON line, or CSV rows (per span & count)"""
+    if file_format == "JSON":
+        with open(path, "a") as f:
+            f.write(json.dumps(report) + "\n")
+        return
+    new = not os.path.exists(path)
+    with open(path, "a", newline="") as f:
+        writer = csv.writer(f)
+        if new:
+            writer.writerow(("time", "image", "component", "kind", "name", "value"))
+        row = (report["time"], report.get("image", ""))
+        for span in report["spans"]:
+            writer.writerow(
+                row + (span["component"], "seconds", span["stage"], span["ns"] / 1e9)
+            )
+        for component, counters in report["counters"].items():
+            for name, value in counters.items():
+                writer.writerow(row + (component, "count", name, value))
+        writer.writerow(row + ("", "seconds", "Total", report["total_ns"] / 1e9))
+        peak = report["process_peak_rss_mb"]
+        writer.writerow(row + ("", "mb", "Process Peak RSS", peak))
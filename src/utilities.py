@@ -1,8 +1,30 @@
+import os
+import sys
 import bpy
-from collections import Counter
+import numpy as np
 
 kei2m_version = 1.307
 
+# Shared pixel readout buffer, reused across axes & batch items (grown as needed)
+_pixel_buffer = None
+
+# Image file types picked up by the batch (folder) & command line processing
+IMAGE_EXTENSIONS = (
+    ".png",
+    ".tif",
+    ".tiff",
+    ".exr",
+    ".hdr",
+    ".tga",
+    ".sgi",
+    ".rgb",
+    ".bw",
+    ".jp2",
+    ".j2c",
+    ".cin",
+    ".dpx",
+)
+
 
 def load_slot(path):
     try:
@@ -12,6 +34,31 @@ def load_slot(path):
     return img
 
 
+def stream_images(folder, extensions):
+    """Load the folder's images (matching extensions) one directory entry at a time,
+    as they are handed out. (Loading only makes the datablock, the pixels are read on
+    first use: Loading ahead would only hold more images, the conversion is serial)"""
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.name.lower().endswith(extensions):
+                img = load_slot(entry.path)
+                if img is not None:
+                    yield img
+
+
+def release_image(img, keep=()):
+    """Free a (batch) image when done: Its pixel buffers are freed (reloaded from file
+    on demand). The image itself is only removed if unused: The converted object's
+    image material keeps a user, and needs the image for its texture. Images in keep
+    are left alone"""
+    if img in keep:
+        return
+    if img.users == 0:
+        bpy.data.images.remove(img)
+    else:
+        img.buffers_free()
+
+
 def is_bversion(req_ver):
     """Is current Blender version the required version (as int: #### )"""
     if int("".join([str(i) for i in bpy.app.version]).ljust(4, "0")) < req_ver:
@@ -19,10 +66,114 @@ def is_bversion(req_ver):
     return True
 
 
-def make_entry(h, width, w, pixels):
-    idx = (h * width) + w
-    px_index = idx * 4
-    return pixels[px_index : px_index + 4]
+def read_pixels(img):
+    """Read image pixels into the shared float32 buffer with foreach_get.
+    (img.pixels[:] would build a tuple of w*h*4 boxed Python floats)
+    Note: The returned array is only valid until the next read_pixels call"""
+    global _pixel_buffer
+    size = len(img.pixels)
+    if _pixel_buffer is None or _pixel_buffer.size < size:
+        _pixel_buffer = np.empty(size, dtype=np.float32)
+    pixels = _pixel_buffer[:size]
+    img.pixels.foreach_get(pixels)
+    return pixels
+
+
+def process_peak_rss():
+    """Peak resident memory of this (Blender) process so far in MB (ru_maxrss: Only
+    ever rises, not a per stage or per run peak), None if unavailable"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        # bytes on macOS, kilobytes elsewhere
+        peak /= 1024
+    return peak / 1024
+
+
+def fill_mesh(mesh, verts, loops, loop_starts):
+    """Bulk-fill an empty mesh from flat arrays with foreach_set (instead of from_pydata)"""
+    mesh.vertices.add(len(verts))
+    mesh.vertices.foreach_set("co", np.ascontiguousarray(verts, np.float32).ravel())
+    mesh.loops.add(len(loops))
+    mesh.loops.foreach_set("vertex_index", np.ascontiguousarray(loops, np.int32))
+    mesh.polygons.add(len(loop_starts))
+    loop_starts = np.ascontiguousarray(loop_starts, np.int32)
+    mesh.polygons.foreach_set("loop_start", loop_starts)
+    if not is_bversion(4000):
+        # Read-only (derived from loop_start) in 4.0+
+        loop_totals = np.diff(np.append(loop_starts, len(loops))).astype(np.int32)
+        mesh.polygons.foreach_set("loop_total", loop_totals)
+    mesh.update(calc_edges=True)
+
+
+def apply_modifiers(context, obj):
+    """Bake an object's whole modifier stack into its mesh in one depsgraph evaluation
+    (new_from_object): No modifier_apply round-trips (context, active object & undo
+    step per modifier), so it also works in background workers. Removes the modifiers"""
+    if not obj.modifiers:
+        return
+    if not is_bversion(2900):
+        context.view_layer.objects.active = obj
+        for m in list(obj.modifiers):
+            bpy.ops.object.modifier_apply(modifier=m.name)
+        return
+    depsgraph = context.evaluated_depsgraph_get()
+    mesh = bpy.data.meshes.new_from_object(
+        obj.evaluated_get(depsgraph),
+        preserve_all_data_layers=True,
+        depsgraph=depsgraph,
+    )
+    old = obj.data
+    obj.modifiers.clear()
+    obj.data = mesh
+    name = old.name
+    if not old.users:
+        bpy.data.meshes.remove(old)
+    mesh.name = name
+
+
+def read_mesh_arrays(mesh):
+    """Flat mesh arrays (as used by fill_mesh) + face material indices, via foreach_get"""
+    verts = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", verts)
+    loops = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loops)
+    loop_starts = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_start", loop_starts)
+    material_index = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("material_index", material_index)
+    return verts.reshape(-1, 3), loops, loop_starts, material_index
+
+
+def write_vertex_colors(mesh, loop_colors):
+    """Per-loop (n, 4) sRGB colors into a new "Col" corner color layer"""
+    loop_colors = np.ascontiguousarray(loop_colors, np.float32).ravel()
+    if is_bversion(3400):
+        vc = mesh.color_attributes.new("Col", "BYTE_COLOR", "CORNER")
+        # sRGB, as stored by the legacy vertex_colors layer
+        vc.data.foreach_set("color_srgb", loop_colors)
+        mesh.attributes.active_color = vc
+    else:
+        vc = mesh.vertex_colors.new()
+        vc.data.foreach_set("color", loop_colors)
+
+
+def read_vertex_colors(mesh):
+    """Per-loop (n, 4) sRGB colors of the active color layer (None if there is none)"""
+    if is_bversion(3400):
+        vc = mesh.attributes.active_color
+        attr = "color_srgb"
+    else:
+        vc = mesh.vertex_colors.active
+        attr = "color"
+    if vc is None:
+        return None
+    loop_colors = np.empty(len(mesh.loops) * 4, dtype=np.float32)
+    vc.data.foreach_get(attr, loop_colors)
+    return loop_colors.reshape(-1, 4)
 
 
 def alpha_check(images, rgb=False, c2m=False):
@@ -31,35 +182,3 @@ def alpha_check(images, rgb=False, c2m=False):
         if img.depth != 32 and not rgb and not c2m:
             has_alpha = False
     return has_alpha
-
-
-def reduce_colors(pixelmap, threshold=0.51, cap=None):
-    colors = [p[2] for p in pixelmap if p[2][3] == 1]
-    color_groups = []
-    common_colors = [c for c in Counter(colors).most_common()]
-    if cap is not None:
-        if len(common_colors) > cap:
-            common_colors = common_colors[:cap]
-    for c in common_colors:
-        rmin = c[0][0] - threshold
-        rmax = c[0][0] + threshold
-        gmin = c[0][1] - threshold
-        gmax = c[0][1] + threshold
-        bmin = c[0][2] - threshold
-        bmax = c[0][2] + threshold
-        similar = [[c][0]]
-        for oc in reversed(common_colors):
-            if oc != c:
-                if (
-                    rmin < oc[0][0] < rmax
-                    and gmin < oc[0][1] < gmax
-                    and bmin < oc[0][2] < bmax
-                ):
-                    similar.append(oc[0])
-                    common_colors.remove(oc)
-        color_groups.append(similar)
-    for p in pixelmap:
-        for i, g in enumerate(color_groups):
-            if p[2] in g:
-                p[2] = g[0][0]
-    return pixelmap, [g[0][0] for g in color_groups]
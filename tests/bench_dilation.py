@@ -0,0 +1,84 @@
+"""Expand Border benchmark: the old brute force dx/dy loop vs separable dilation.
+
+No Blender needed:  python tests/bench_dilation.py [res]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
+
+from core import dilate, dilate_pixels  # noqa: E402
+from bench_pixelmap import synthetic_image  # noqa: E402
+
+# Skip the old loop beyond this many inner iterations (it would take minutes)
+LOOP_BUDGET = 3e7
+
+
+def loop_dilation(width, height, pixels, tolerance, dilation):
+    # The pre-vectorization KeI2M.make_pixel_map dilation (alpha path)
+    tot = len(pixels)
+    pm_dilated = list(pixels)
+    for w in range(0, width):
+        for h in range(0, height):
+            idx = ((h * width) + w) * 4
+            if pixels[idx + 3] >= tolerance:
+                for dx in range(-dilation, dilation):
+                    for dy in range(-dilation, dilation):
+                        i = (((h + dy) * width) + (w + dx)) * 4
+                        if 0 < i < tot:
+                            pm_dilated[i + 3] = 1
+    return tuple(pm_dilated)
+
+
+def shifted_dilation(mask, radius):
+    # Plain reference: OR of every shift in the square window
+    h, w = mask.shape
+    padded = np.pad(mask, radius)
+    out = np.zeros_like(mask)
+    for dy in range(2 * radius + 1):
+        for dx in range(2 * radius + 1):
+            out |= padded[dy : dy + h, dx : dx + w]
+    return out
+
+
+def run(res, dilation, tolerance=0.95):
+    rgba = synthetic_image(res)
+    opaque = int((rgba[..., 3] >= tolerance).sum())
+
+    t_loop = None
+    if opaque * (2 * dilation) ** 2 <= LOOP_BUDGET:
+        pixels = tuple(rgba.ravel().tolist())
+        t = time.perf_counter()
+        loop_dilation(res, res, pixels, tolerance, dilation)
+        t_loop = time.perf_counter() - t
+
+    t = time.perf_counter()
+    dilate_pixels(rgba, dilation, tolerance)
+    t_vec = time.perf_counter() - t
+
+    if dilation <= 16:
+        mask = rgba[..., 3] >= np.float32(tolerance)
+        assert (dilate(mask, dilation) == shifted_dilation(mask, dilation)).all()
+
+    if t_loop is None:
+        loop, speedup = "skipped", "-"
+    else:
+        loop = "%.4fs" % t_loop
+        speedup = "%.1fx" % (t_loop / max(t_vec, 1e-9))
+    print(
+        "{:>5} {:>8} {:>11} {:>10.4f}s {:>9}".format(
+            res, dilation, loop, t_vec, speedup
+        )
+    )
+
+
+if __name__ == "__main__":
+    sizes = [int(a) for a in sys.argv[1:]] or [128, 512]
+    print("  res dilation        loop   separable   speedup")
+    for size in sizes:
+        for d in (1, 4, 16, 99):
+            run(size, d)
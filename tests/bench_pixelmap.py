@@ -0,0 +1,79 @@
+"""Pixel map benchmark: the old per-pixel w/h loops vs the vectorized core.
+
+No Blender needed:  python tests/bench_pixelmap.py [sizes...]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
+
+from core import as_rgba, pixel_arrays  # noqa: E402
+
+
+def make_entry(h, width, w, pixels):
+    idx = (h * width) + w
+    px_index = idx * 4
+    return pixels[px_index : px_index + 4]
+
+
+def loop_pixel_map(width, height, pixels, scl, tolerance, start, width_range):
+    # The pre-vectorization KeI2M.make_pixel_map (alpha path)
+    pixel_map = []
+    for w in range(start, width_range):
+        for h in range(0, height):
+            rgba = make_entry(h, width, w, pixels)
+            if rgba[3] >= tolerance:
+                pixel_map.append([w * scl, h * scl, rgba])
+    return pixel_map
+
+
+def synthetic_image(res, seed=0):
+    # Soft blobs on a transparent background, with anti-aliased edges
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:res, 0:res] / res
+    alpha = np.zeros((res, res), dtype=np.float32)
+    for cx, cy, r in rng.uniform((0.2, 0.2, 0.05), (0.8, 0.8, 0.3), size=(8, 3)):
+        d = np.sqrt((x - cx) ** 2 + (y - cy) ** 2)
+        alpha = np.maximum(alpha, np.clip((r - d) * res * 0.25, 0, 1))
+    rgba = rng.random((res, res, 4), dtype=np.float32)
+    rgba[..., 3] = alpha
+    return rgba
+
+
+def run(res, tolerance=0.95, screw=False):
+    rgba = synthetic_image(res)
+    pixels = tuple(rgba.ravel().tolist())  # what img.pixels[:] used to hand out
+    buffer = rgba.ravel()  # what read_pixels (foreach_get) hands out
+    scl = 1 / res
+    start, stop = 0, int(res / 2) if screw else res
+
+    t = time.perf_counter()
+    reference = loop_pixel_map(res, res, pixels, scl, tolerance, start, stop)
+    t_loop = time.perf_counter() - t
+
+    t = time.perf_counter()
+    pixel_xy, colors = pixel_arrays(
+        as_rgba(buffer, res, res), tolerance, start=start, stop=stop
+    )
+    t_vec = time.perf_counter() - t
+
+    assert len(reference) == len(pixel_xy), "face count mismatch"
+    assert [[p[0], p[1]] for p in reference] == (pixel_xy * scl).tolist()
+    assert [list(p[2]) for p in reference] == colors.tolist()
+
+    print(
+        "{:>5} {:>9} {:>10.4f}s {:>10.4f}s {:>8.1f}x".format(
+            res, len(pixel_xy), t_loop, t_vec, t_loop / max(t_vec, 1e-9)
+        )
+    )
+
+
+if __name__ == "__main__":
+    sizes = [int(a) for a in sys.argv[1:]] or [128, 512, 1024, 4096]
+    print("  res     faces       loop  vectorized  speedup")
+    for size in sizes:
+        run(size)
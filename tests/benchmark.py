@@ -0,0 +1,232 @@
+"""Stage benchmark: times each conversion stage over the geo / reduce / vcolor /
+dilation / work res matrix, on synthetic & real images, & checks for regressions.
+
+Needs the built addon (pdm run build) & bpy:
+    python tests/benchmark.py [--full] [--repeat 3] [--threshold 0.25]
+    python tests/benchmark.py --update-baseline   (store the current timings)
+
+Results (per stage seconds & peak memory per case) go to --output as JSON. A stage
+slower than baseline * (1 + threshold), by more than --min-delta seconds, fails.
+So does a case's peak memory above baseline * (1 + threshold), by more than
+--min-delta-mb. The peak is measured per case with tracemalloc in an extra, untimed
+run: Python & NumPy allocations, not Blender's own (mesh) data.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+
+import bpy
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+REAL_IMAGE = os.path.join(HERE, "NASA_logo.svg.png")
+BASELINE = os.path.join(HERE, "benchmark_baseline.json")
+
+# VOXEL: The Boolean geo mode with the voxel hull engine (BOOLEAN: Modifiers)
+GEOS = ("PLANE", "SCREW", "BOOLEAN", "VOXEL", "C2M")
+REDUCES = ("REDUCED", "SIMPLE", "DISSOLVE", "NONE", "OUTLINE")
+C2M_REDUCES = ("DISSOLVE", "NONE")
+RESOLUTIONS = (64, 128, 256, 512, 1024, 2048)
+
+
+def synthetic_image(res, seed=0):
+    # Flat colored blobs with anti-aliased (soft alpha) edges
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:res, 0:res] / res
+    rgba = np.zeros((res, res, 4), dtype=np.float32)
+    for cx, cy, r in rng.uniform((0.2, 0.2, 0.05), (0.8, 0.8, 0.3), size=(8, 3)):
+        d = np.sqrt((x - cx) ** 2 + (y - cy) ** 2)
+        alpha = np.clip((r - d) * res * 0.25, 0, 1)
+        over = alpha > rgba[..., 3]
+        rgba[over, :3] = rng.random(3)
+        rgba[..., 3] = np.maximum(rgba[..., 3], alpha)
+    # Saved & loaded back: A copy of a generated image is regenerated (blank), and
+    # the conversion works on a (scaled) copy
+    name = "synthetic_%d" % res
+    path = os.path.join(tempfile.gettempdir(), name + ".png")
+    img = bpy.data.images.new(name, res, res, alpha=True)
+    img.pixels.foreach_set(rgba.ravel())
+    img.filepath_raw = path
+    img.file_format = "PNG"
+    img.save()
+    bpy.data.images.remove(img)
+    img = bpy.data.images.load(path)
+    img.name = name
+    return img
+
+
+def cases(full=False):
+    """(geo, reduce, vcolor, dilation, res) combinations"""
+    if full:
+        for geo, res, vcolor, dilation in itertools.product(
+            GEOS, RESOLUTIONS, (False, True), (0, 2)
+        ):
+            for reduce in C2M_REDUCES if geo == "C2M" else REDUCES:
+                if not (vcolor and geo == "C2M"):
+                    yield geo, reduce, vcolor, dilation, res
+        return
+    # Every geo & reduce mode at one res, the options, and a res sweep
+    for geo in GEOS:
+        for reduce in C2M_REDUCES if geo == "C2M" else REDUCES:
+            yield geo, reduce, False, 0, 256
+    yield "PLANE", "NONE", True, 0, 256
+    yield "PLANE", "SIMPLE", False, 4, 256
+    for res in RESOLUTIONS:
+        yield "PLANE", "NONE", False, 0, res
+        yield "PLANE", "OUTLINE", False, 0, res
+        if res <= 1024:
+            # (The voxel hull cost grows with the res cubed)
+            yield "VOXEL", "SIMPLE", False, 0, res
+
+
+def run_case(k, profiler, remove_objects, geo, reduce, vcolor, dilation, res):
+    k.geo = "BOOLEAN" if geo == "VOXEL" else geo
+    existing = set(bpy.data.objects)
+    profiler.reports.clear()
+    options = dict(
+        custom_workres=res, vcolor=vcolor, dilation=dilation, front_only=False
+    )
+    if k.geo == "BOOLEAN":
+        options["bool_engine"] = "VOXEL" if geo == "VOXEL" else "MODIFIER"
+    if geo == "C2M":
+        options["c2m_reduce"] = reduce
+    else:
+        options["reduce"] = reduce
+    bpy.ops.ke.i2m(**options)
+    remove_objects([o for o in bpy.data.objects if o not in existing])
+    return profiler.stage_seconds(profiler.reports[-1])
+
+
+def case_peak_memory(*args):
+    """Peak traced (Python & NumPy) memory of one run of a case, in MB"""
+    tracemalloc.start()
+    try:
+        run_case(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1048576
+
+
+def compare(results, baseline, threshold, min_delta, min_delta_mb=1.0):
+    """Stages slower (& peaks bigger) than the baseline, past the threshold, as
+    report lines"""
+    regressions = []
+    for case, result in results.items():
+        base = baseline.get(case)
+        if base is None:
+            continue
+        before = base.get("peak_memory_mb")
+        peak = result["peak_memory_mb"]
+        if before and peak > before * (1 + threshold) and peak - before > min_delta_mb:
+            regressions.append(
+                "%s: Peak memory %.1fMB -> %.1fMB (+%.0f%%)"
+                % (case, before, peak, (peak / before - 1) * 100)
+            )
+        for stage, seconds in result["stages"].items():
+            before = base["stages"].get(stage)
+            if before is None:
+                continue
+            if seconds > before * (1 + threshold) and seconds - before > min_delta:
+                regressions.append(
+                    "%s: %s %.4fs -> %.4fs (+%.0f%%)"
+                    % (case, stage, before, seconds, (seconds / before - 1) * 100)
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="kei2m stage benchmark")
+    parser.add_argument("--full", action="store_true", help="Run the full matrix")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case (min)")
+    parser.add_argument("--max-res", type=int, default=2048)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.25)
+    parser.add_argument("--min-delta", type=float, default=0.01)
+    parser.add_argument("--min-delta-mb", type=float, default=1.0)
+    parser.add_argument("--update-baseline", action="store_true")
+    argv = sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else sys.argv[1:]
+    args = parser.parse_args(argv)
+
+    bpy.ops.preferences.addon_install(filepath="dist/ke_i2m.zip")
+    bpy.ops.preferences.addon_enable(module="ke_i2m")
+    from ke_i2m.cli import remove_objects
+    from ke_i2m import profiler
+
+    context = bpy.context
+    k = context.scene.kei2m
+    kap = context.preferences.addons["ke_i2m"].preferences
+    # Time the stages, not the caches
+    kap.cache_budget = 0
+    kap.disk_cache = False
+    # (The case peaks use tracemalloc themselves)
+    kap.profile_capture = "NONE"
+
+    images = {"real": bpy.data.images.load(REAL_IMAGE)}
+    results = {}
+    for geo, reduce, vcolor, dilation, res in cases(args.full):
+        if res > args.max_res:
+            continue
+        for source in ("synthetic", "real"):
+            if source == "synthetic":
+                img = bpy.data.images.get("synthetic_%d" % res) or synthetic_image(res)
+            else:
+                img = images["real"]
+            # Boolean: Same image on all 3 axes
+            bpy.ops.ke.i2m_clearslot(axis="ALL")
+            k.FRONT = img.name
+            if geo in ("BOOLEAN", "VOXEL"):
+                k.RIGHT = img.name
+                k.TOP = img.name
+
+            case = "%s-%s%s%s-%d-%s" % (
+                geo,
+                reduce,
+                "-vcolor" if vcolor else "",
+                "-dilation%d" % dilation if dilation else "",
+                res,
+                source,
+            )
+            run = (k, profiler, remove_objects, geo, reduce, vcolor, dilation, res)
+            runs = [run_case(*run) for _ in range(args.repeat)]
+            stages = {s: min(r.get(s, 0) for r in runs) for s in runs[0]}
+            peak = case_peak_memory(*run)
+            results[case] = {"stages": stages, "peak_memory_mb": peak}
+            sys.stdout.write(
+                "BENCH %-40s %8.4fs %8.1fMB\n" % (case, sum(stages.values()), peak)
+            )
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=1, sort_keys=True)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=1, sort_keys=True)
+        sys.stdout.write("Baseline updated: %s\n" % args.baseline)
+        return
+
+    if not os.path.exists(args.baseline):
+        sys.stdout.write("No baseline (run with --update-baseline to store one)\n")
+        return
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(
+        results, baseline, args.threshold, args.min_delta, args.min_delta_mb
+    )
+    for line in regressions:
+        sys.stdout.write("REGRESSION %s\n" % line)
+    if regressions:
+        sys.exit(1)
+    sys.stdout.write(
+        "No stage regressions (threshold %.0f%%)\n" % (args.threshold * 100)
+    )
+
+
+if __name__ == "__main__":
+    main()
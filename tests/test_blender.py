@@ -0,0 +1,105 @@
+"""Operator runs in Blender: Tiled mode & batch post-stages end to end.
+
+Needs bpy & the built addon (pdm run build):  python -m pytest tests/test_blender.py
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+bpy = pytest.importorskip("bpy")
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+ADDON = os.path.join(ROOT, "dist", "ke_i2m.zip")
+REAL_IMAGE = os.path.join(HERE, "NASA_logo.svg.png")
+
+
+@pytest.fixture(scope="module")
+def k():
+    if not os.path.exists(ADDON):
+        pytest.skip("addon not built")
+    bpy.ops.preferences.addon_install(filepath=ADDON)
+    bpy.ops.preferences.addon_enable(module="ke_i2m")
+    kap = bpy.context.preferences.addons["ke_i2m"].preferences
+    kap.cache_budget = 0
+    kap.disk_cache = False
+    yield bpy.context.scene.kei2m
+    bpy.ops.preferences.addon_disable(module="ke_i2m")
+
+
+def convert(k, geo, **options):
+    """One operator run on the real image: The new mesh's vert & face counts and
+    bounding box"""
+    from ke_i2m.cli import remove_objects
+
+    image = bpy.data.images.get("NASA_logo.svg.png") or bpy.data.images.load(
+        REAL_IMAGE
+    )
+    bpy.ops.ke.i2m_clearslot(axis="ALL")
+    k.geo = geo
+    k.FRONT = image.name
+    if geo == "BOOLEAN":
+        k.RIGHT = image.name
+        k.TOP = image.name
+    existing = set(bpy.data.objects)
+    options.setdefault("shade_smooth", False)
+    assert bpy.ops.ke.i2m(front_only=False, **options) == {"FINISHED"}
+    new = [o for o in bpy.data.objects if o not in existing]
+    mesh = [o for o in new if o.type == "MESH"][0].data
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    co = co.reshape(-1, 3)
+    result = len(mesh.vertices), len(mesh.polygons), co.min(axis=0), co.max(axis=0)
+    remove_objects(new)
+    return result
+
+
+@pytest.mark.parametrize("geo", ["PLANE", "SCREW", "BOOLEAN"])
+@pytest.mark.parametrize("reduce", ["REDUCED", "SIMPLE", "DISSOLVE", "NONE", "OUTLINE"])
+@pytest.mark.parametrize("tile_size", [64, 100])
+def test_tiled_runs(k, geo, reduce, tile_size):
+    verts, faces, _, _ = convert(
+        k, geo, custom_workres=256, tile_size=tile_size, reduce=reduce
+    )
+    assert verts and faces
+
+
+@pytest.mark.parametrize("geo", ["PLANE", "SCREW"])
+def test_tiled_matches_untiled(k, geo):
+    # Unreduced: The same pixels, so the same (welded) mesh
+    untiled = convert(k, geo, custom_workres=256, reduce="NONE")
+    tiled = convert(k, geo, custom_workres=256, tile_size=100, reduce="NONE")
+    assert tiled[:2] == untiled[:2]
+    assert np.allclose(tiled[2], untiled[2]) and np.allclose(tiled[3], untiled[3])
+
+
+def test_batch_atlas_instanced(k, tmp_path):
+    # Byte copies: One (instanced) mesh, two atlas rects of the same size
+    import shutil
+
+    for name in ("a.png", "b.png"):
+        shutil.copy(REAL_IMAGE, tmp_path / name)
+    kap = bpy.context.preferences.addons["ke_i2m"].preferences
+    kap.batch_workers = 1
+    kap.batch_atlas = True
+    k.geo = "PLANE"
+    k.custom_workres = 64
+    k.shade_smooth = False
+    existing = set(bpy.data.objects)
+    try:
+        bpy.ops.ke.i2m_batchbrowser(filepath=str(tmp_path) + os.sep)
+    finally:
+        kap.batch_atlas = False
+        k.custom_workres = 0
+    objects = [o for o in bpy.data.objects if o not in existing and o.type == "MESH"]
+    assert len(objects) == 2
+    spans = []
+    for obj in objects:
+        uv_layer = obj.data.uv_layers.active
+        uvs = np.empty(len(obj.data.loops) * 2, dtype=np.float32)
+        uv_layer.data.foreach_get("uv", uvs)
+        uvs = uvs.reshape(-1, 2)
+        spans.append(uvs.max(axis=0) - uvs.min(axis=0))
+    assert np.allclose(spans[0], spans[1], atol=1e-4)
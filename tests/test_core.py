@@ -0,0 +1,366 @@
+"""Core array checks: Hull, atlas packing, UV projection, tiles, outlines, palette &
+material indices.
+
+No Blender needed:  python tests/test_core.py  (or python -m pytest tests/test_core.py)
+"""
+
+import itertools
+import os
+import sys
+from collections import Counter
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
+
+from core import (  # noqa: E402
+    PROJECTOR_ROTATIONS,
+    axis_material_index,
+    grid_arrays,
+    hull_arrays,
+    outline_arrays,
+    outline_loops,
+    pixel_mask,
+    project_uvs,
+    projector_matrix,
+    reduce_colors,
+    shelf_pack,
+    stitch_tiles,
+    tile_grid,
+    tile_mesh_arrays,
+)
+from core.contour import crossing_loops  # noqa: E402
+from core.triangulate import signed_area  # noqa: E402
+
+
+def disk_mask(res, cx=0.5, cy=0.5, r=0.4):
+    y, x = (np.mgrid[0:res, 0:res] + 0.5) / res
+    return (x - cx) ** 2 + (y - cy) ** 2 <= r * r
+
+
+def noisy_mask(res, seed):
+    rng = np.random.default_rng(seed)
+    return disk_mask(res) ^ (rng.random((res, res)) < 0.08)
+
+
+def faces(loops, loop_starts):
+    return np.split(np.asarray(loops), np.asarray(loop_starts)[1:])
+
+
+def edge_counts(loops, loop_starts):
+    """Directed edge -> count, over all faces"""
+    counts = {}
+    for face in faces(loops, loop_starts):
+        for a, b in zip(face, np.roll(face, -1)):
+            counts[a, b] = counts.get((a, b), 0) + 1
+    return counts
+
+
+def signed_volume(verts, loops, loop_starts):
+    volume = 0.0
+    for face in faces(loops, loop_starts):
+        co = verts[face]
+        for b, c in zip(co[1:-1], co[2:]):
+            volume += np.dot(co[0], np.cross(b, c)) / 6
+    return volume
+
+
+def plane_area(verts, loops, loop_starts, axes=(0, 2)):
+    """Signed area of the faces on the image plane (Front: x & z)"""
+    area = 0.0
+    for face in faces(loops, loop_starts):
+        u, v = verts[face][:, axes[0]], verts[face][:, axes[1]]
+        area += 0.5 * (np.dot(u, np.roll(v, -1)) - np.dot(np.roll(u, -1), v))
+    return area
+
+
+def open_length(verts, loops, loop_starts):
+    """Total length of the edges without a (reversed) neighbour"""
+    counts = edge_counts(loops, loop_starts)
+    return sum(
+        np.linalg.norm(verts[a] - verts[b]) for a, b in counts if (b, a) not in counts
+    )
+
+
+def perimeter(loops):
+    return sum(
+        np.linalg.norm(np.diff(loop, axis=0, append=loop[:1]), axis=1).sum()
+        for loop in loops
+    )
+
+
+def check_hull(front, right, top, res, merge_flat):
+    scl = 1 / res
+    verts, loops, loop_starts = hull_arrays(front, right, top, scl, res, merge_flat)
+    assert len(loop_starts), "empty hull"
+    counts = edge_counts(loops, loop_starts)
+    # Closed & consistently wound: Each edge once, its reverse once
+    assert all(n == 1 for n in counts.values()), "edge used twice the same way"
+    assert all((b, a) in counts for a, b in counts), "open edge"
+    assert np.isin(np.arange(len(verts)), loops).all(), "loose verts"
+    volume = signed_volume(verts, loops, loop_starts)
+    assert volume > 0, "hull wound inwards"
+    return volume
+
+
+def test_hull_closed_outward():
+    res = 24
+    full = np.ones((res, res), dtype=bool)
+    disk = disk_mask(res)
+    for masks in ((full, full, full), (disk, None, None), (disk, disk, disk)):
+        volumes = [check_hull(*masks, res, merge_flat) for merge_flat in (False, True)]
+        assert np.isclose(*volumes), "merging the flat sides changed the volume"
+    # Full masks: The hull spans the whole work_res box
+    verts = hull_arrays(full, full, full, 1 / res, res)[0]
+    assert np.allclose(verts.min(axis=0), (-0.5, -0.5, 0))
+    assert np.allclose(verts.max(axis=0), (0.5, 0.5, 1))
+
+
+def test_hull_merge_noisy():
+    # (Surface nets on noisy voxels are not always manifold: Only compared)
+    res = 24
+    for seed in range(6):
+        mask = noisy_mask(res, seed)
+        meshes = [hull_arrays(mask, mask, mask, 1 / res, res, m) for m in (False, True)]
+        volumes = [signed_volume(*mesh) for mesh in meshes]
+        assert np.isclose(*volumes), "merging the runs changed the volume"
+        verts, loops, loop_starts = meshes[1]
+        assert np.isclose(open_length(verts, loops, loop_starts), 0), "open edges"
+        assert np.isin(np.arange(len(verts)), loops).all(), "loose verts"
+        assert len(loop_starts) < len(meshes[0][2])
+
+
+def test_shelf_pack():
+    rng = np.random.default_rng(3)
+    sizes = [tuple(int(v) for v in s) for s in rng.integers(1, 300, size=(60, 2))]
+    sizes.append((700, 20))  # Too wide: An atlas of its own
+    max_size, padding = 512, 2
+    placements, atlases = shelf_pack(sizes, max_size, padding)
+    rects = {}
+    for (w, h), (a, x, y) in zip(sizes, placements):
+        box = (x - padding, y - padding, x + w + padding, y + h + padding)
+        width, height = atlases[a]
+        assert box[0] >= 0 and box[1] >= 0, "outside the atlas"
+        assert box[2] <= width and box[3] <= height, "outside the atlas"
+        if w + 2 * padding <= max_size:
+            assert width <= max_size and height <= max_size, "atlas too big"
+        rects.setdefault(a, []).append(box)
+    for boxes in rects.values():
+        for p, q in itertools.combinations(boxes, 2):
+            overlap = p[0] < q[2] and q[0] < p[2] and p[1] < q[3] and q[1] < p[3]
+            assert not overlap, "rects overlap"
+
+
+def reference_uvs(verts, loops, loop_starts, normals, projectors):
+    """The UV Project modifier, one corner at a time"""
+    uvs = []
+    for face, normal in zip(faces(loops, loop_starts), normals):
+        axes = [p[:3, 2] for p in projectors]
+        best = int(np.argmax([normal @ axis for axis in axes]))
+        for v in face:
+            local = np.linalg.solve(projectors[best], np.append(verts[v], 1))
+            uvs.append(local[:2] * 0.5 + 0.5)
+    return np.array(uvs)
+
+
+def test_project_uvs():
+    rng = np.random.default_rng(5)
+    verts = rng.uniform(-2, 2, size=(40, 3))
+    loops = rng.integers(0, 40, size=90)
+    loop_starts = np.arange(0, 90, 3)
+    normals = rng.normal(size=(30, 3))
+    projectors = [
+        projector_matrix(r, rng.uniform(0.5, 2, 3), rng.uniform(-1, 1, 3))
+        for r in PROJECTOR_ROTATIONS.values()
+    ]
+    for count in (1, 3, 6):
+        uvs = project_uvs(verts, loops, loop_starts, normals, projectors[:count])
+        expected = reference_uvs(
+            verts, loops, loop_starts, normals, projectors[:count]
+        )
+        assert np.allclose(uvs, expected, atol=1e-5)
+
+    # Unit projectors around a -1..1 cube: Every side covers the whole UV square
+    corners = np.array(list(itertools.product((-1, 1), repeat=3)), dtype=np.float64)
+    sides = []
+    normals = []
+    for axis, sign in itertools.product(range(3), (-1, 1)):
+        sides.extend(np.flatnonzero(corners[:, axis] == sign))
+        normals.append(np.eye(3)[axis] * sign)
+    projectors = [
+        projector_matrix(r, (1, 1, 1), (0, 0, 0)) for r in PROJECTOR_ROTATIONS.values()
+    ]
+    uvs = project_uvs(
+        corners, np.array(sides), np.arange(0, 24, 4), np.array(normals), projectors
+    )
+    for face in np.split(np.round(uvs, 5), 6):
+        assert sorted(map(tuple, face)) == [(0, 0), (0, 1), (1, 0), (1, 1)]
+
+
+def tiled_mesh(mask, tile_size, outline_tolerance=None):
+    res = len(mask)
+    pixel_xy = np.argwhere(mask)
+    parts = []
+    for tile in tile_grid(res, tile_size):
+        x, y, width, height = tile
+        inside = (
+            (pixel_xy[:, 0] >= x)
+            & (pixel_xy[:, 0] < x + width)
+            & (pixel_xy[:, 1] >= y)
+            & (pixel_xy[:, 1] < y + height)
+        )
+        if inside.any():
+            parts.append(
+                tile_mesh_arrays(
+                    pixel_xy[inside], tile, res, 1 / res, "Front", outline_tolerance
+                )
+            )
+    return stitch_tiles(parts)
+
+
+def face_set(verts, loops, loop_starts):
+    co = np.round(verts * 1e4).astype(np.int64)
+    return {frozenset(map(tuple, co[face])) for face in faces(loops, loop_starts)}
+
+
+def corner_coords(verts, res):
+    """Front vertex coords back to pixel corner grid coords"""
+    co = np.column_stack((verts[:, 0], verts[:, 2]))
+    return np.round(co * res + (res / 2 + 0.5, 0.5))
+
+
+def seam_cracks(verts, loops, loop_starts, mask, tile_size):
+    """Open edges running along a tile seam with pixels on both sides of them"""
+    res = len(mask)
+    co = corner_coords(verts, res)
+    counts = edge_counts(loops, loop_starts)
+    cracks = []
+    for a, b in counts:
+        if (b, a) in counts:
+            continue
+        (xa, ya), (xb, yb) = co[a], co[b]
+        if xa == xb and 0 < xa < res and xa % tile_size == 0:
+            y = int(min(ya, yb))
+            cracks += [(a, b)] * bool(mask[int(xa) - 1, y] and mask[int(xa), y])
+        elif ya == yb and 0 < ya < res and ya % tile_size == 0:
+            x = int(min(xa, xb))
+            cracks += [(a, b)] * bool(mask[x, int(ya) - 1] and mask[x, int(ya)])
+    return cracks
+
+
+def test_tiles_match_untiled():
+    res = 40
+    mask = disk_mask(res, 0.45, 0.55, 0.37)
+    scl = 1 / res
+    pixel_xy = np.argwhere(mask)
+    grid = grid_arrays(pixel_xy, scl, res)
+    for tile_size in (8, 13):
+        tiled = tiled_mesh(mask, tile_size)
+        assert len(tiled[0]) == len(grid[0]), "seam vertices not welded"
+        assert face_set(*tiled) == face_set(*grid)
+
+    area = mask.sum() * scl * scl
+    untiled = outline_arrays(mask, scl, res, tolerance=0.0)
+    outline = perimeter(outline_loops(mask, 0.0)) * scl
+    assert np.isclose(plane_area(*untiled), area)
+    assert np.isclose(open_length(*untiled), outline), "T-junctions"
+    for tile_size, tolerance in itertools.product((8, 13), (0.0, 1.0)):
+        tiled = tiled_mesh(mask, tile_size, tolerance)
+        assert not seam_cracks(*tiled, mask, tile_size), "open edges along a seam"
+        if not tolerance:
+            # Unsimplified: Exactly the pixels & outline, same as untiled
+            assert np.isclose(plane_area(*tiled), area)
+            assert np.isclose(open_length(*tiled), outline), "T-junctions"
+
+
+def test_outline_noisy_masks():
+    res = 32
+    scl = 1 / res
+    for seed in range(40):
+        mask = noisy_mask(res, seed)
+        for tolerance in (0.0, 1.0):
+            loops = outline_loops(mask, tolerance)
+            assert not crossing_loops(loops), "simplified loops cross"
+            # Filled without gaps or overlaps: The faces add up to the loops' area
+            expected = sum(signed_area(loop) for loop in loops) * scl * scl
+            mesh = outline_arrays(mask, scl, res, tolerance=tolerance)
+            assert np.isclose(plane_area(*mesh), expected), "outline fill area off"
+            # No T-junctions: The only open edges are the loops' own
+            assert np.isclose(open_length(*mesh), perimeter(loops) * scl)
+        assert np.isclose(
+            plane_area(*outline_arrays(mask, scl, res, tolerance=0.0)),
+            mask.sum() * scl * scl,
+        )
+
+
+def test_pixel_mask_roundtrip():
+    mask = noisy_mask(16, 1)
+    assert (pixel_mask(np.argwhere(mask), 16, 16) == mask).all()
+
+
+def reference_reduce_colors(pixel_colors, threshold=0.51, cap=None):
+    """The old (list & Counter) palette reduction"""
+    pixel_colors = [tuple(c) for c in pixel_colors.tolist()]
+    colors = [c for c in pixel_colors if c[3] == 1]
+    color_groups = []
+    common_colors = list(Counter(colors).most_common())
+    if cap is not None and len(common_colors) > cap:
+        common_colors = common_colors[:cap]
+    for c in common_colors:
+        similar = [c[0]]
+        for oc in reversed(common_colors):
+            if oc != c and all(
+                c[0][i] - threshold < oc[0][i] < c[0][i] + threshold for i in range(3)
+            ):
+                similar.append(oc[0])
+                common_colors.remove(oc)
+        color_groups.append(similar)
+    for p, pc in enumerate(pixel_colors):
+        for g in color_groups:
+            if pc in g:
+                pc = pixel_colors[p] = g[0]
+    pixel_colors = np.array(pixel_colors, dtype=np.float32).reshape(-1, 4)
+    return pixel_colors, [g[0] for g in color_groups]
+
+
+def test_reduce_colors():
+    rng = np.random.default_rng(7)
+    for n in range(30):
+        # Few distinct colors (repeats & ties), some of them transparent
+        palette = rng.integers(0, 12, size=(int(rng.integers(1, 40)), 3)) / 11
+        colors = palette[rng.integers(0, len(palette), size=300)]
+        alpha = np.where(rng.random(300) < 0.2, 0.5, 1.0)
+        colors = np.column_stack((colors, alpha)).astype(np.float32)
+        threshold = (0.0, 0.05, 0.1, 0.25, 0.51)[n % 5]
+        cap = (None, 5)[n % 2]
+        reduced, leaders, _ = reduce_colors(colors, threshold, cap)
+        expected, expected_leaders = reference_reduce_colors(colors, threshold, cap)
+        assert leaders == expected_leaders
+        assert (reduced == expected).all()
+
+
+def test_axis_material_index():
+    rng = np.random.default_rng(11)
+    normals = rng.normal(size=(500, 3)).astype(np.float32)
+    normals /= np.linalg.norm(normals, axis=1)[:, None]
+    # Projector vectors as sorted for the slots: Front twice, overlapping tolerances
+    vecs = [(0, 1, 0), (0, 1, 0), (-1, 0, 0), (0, 0, -1), (1, 0, 0), (0, -1, 0)]
+    for count, angle in itertools.product((0, 1, 3, 6), (0.0, 0.3, 0.5, 0.9)):
+        idx = list(range(count, 0, -1))
+        result = axis_material_index(normals, idx, vecs[:count], angle)
+        for n, index in zip(normals, result):
+            # The old loop: The 1st projector facing the face, else 0
+            expected = 0
+            for i, v in zip(idx, vecs[:count]):
+                if -angle > np.dot(n, v) < angle:
+                    expected = i
+                    break
+            assert index == expected
+
+
+if __name__ == "__main__":
+    for name, test in sorted(globals().items()):
+        if not name.startswith("test_"):
+            continue
+        test()
+        print("ok", name)